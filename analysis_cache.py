@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+from article_quality import RULES_VERSION
+from cache_store import cache_path
+from feed_data import analyze_keywords_batch, sentiment_version
+from keyword_extractor import entities_version, extract_entities
+from political_bias import (
+    analyze_political_bias,
+    analyze_political_bias_with_gemini,
+    gemini_bias_enabled,
+    gemini_bias_version,
+    rule_bias_version,
+)
+
+ANALYSIS_FILE = "analysis.sqlite3"
+
+
+def analysis_cache_enabled() -> bool:
+    return os.getenv("NEWS_ANALYSIS_CACHE", "1").lower() not in {"0", "false", "no"}
+
+
+def normalize_text(text: str | None) -> str:
+    return " ".join((text or "").split())
+
+
+def analysis_key(analyzer: str, version: str, text: str | None) -> str:
+    source = f"{analyzer}\0{version}\0{normalize_text(text)}"
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class AnalysisCache:
+    """Sentiment, bias and entity results keyed by analyzer version and input.
+
+    Rows live in a SQLite file in the run cache, so the scraper, cleanup and
+    backfill runs share them. A changed analyzer version changes every key,
+    which retires the old rows; ``close()`` prunes rows no run has read for
+    ``NEWS_ANALYSIS_CACHE_DAYS`` (default 30).
+    """
+
+    def __init__(self, name: str = ANALYSIS_FILE):
+        self.name = name
+        self.connection: sqlite3.Connection | None = None
+        self.lock = threading.Lock()
+        self.metrics: Counter = Counter()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(cache_path(self.name), check_same_thread=False)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS analysis "
+                "(key TEXT PRIMARY KEY, result TEXT NOT NULL, used TEXT NOT NULL)"
+            )
+        return self.connection
+
+    def get_many(self, analyzer: str, version: str, texts: list[str]) -> list:
+        """Cached results for ``texts`` in order, ``None`` where missing."""
+        if not analysis_cache_enabled() or not texts:
+            return [None] * len(texts)
+        keys = [analysis_key(analyzer, version, text) for text in texts]
+        today = datetime.date.today().isoformat()
+        found = {}
+        with self.lock:
+            connection = self._connect()
+            unique = list(dict.fromkeys(keys))
+            # Stay below SQLite's bound-parameter limit.
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    connection.execute(
+                        f"SELECT key, result FROM analysis WHERE key IN ({marks})", chunk
+                    )
+                )
+            with connection:
+                connection.executemany(
+                    "UPDATE analysis SET used = ? WHERE key = ? AND used < ?",
+                    [(today, key, today) for key in found],
+                )
+        results = [json.loads(found[key]) if key in found else None for key in keys]
+        hits = sum(result is not None for result in results)
+        self.metrics[f"{analyzer}_hits"] += hits
+        self.metrics[f"{analyzer}_misses"] += len(results) - hits
+        return results
+
+    def put_many(self, analyzer: str, version: str, texts: list[str], results: list) -> None:
+        if not analysis_cache_enabled() or not texts:
+            return
+        today = datetime.date.today().isoformat()
+        rows = [
+            (analysis_key(analyzer, version, text), json.dumps(result, default=str), today)
+            for text, result in zip(texts, results)
+        ]
+        with self.lock:
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO analysis (key, result, used) VALUES (?, ?, ?)",
+                    rows,
+                )
+
+    def get(self, analyzer: str, version: str, text: str):
+        return self.get_many(analyzer, version, [text])[0]
+
+    def put(self, analyzer: str, version: str, text: str, result) -> None:
+        self.put_many(analyzer, version, [text], [result])
+
+    def map(self, analyzer: str, version: str, texts: list[str], compute, keep=None) -> list:
+        """Results for ``texts``; ``compute`` gets only the missing texts, once.
+
+        ``keep(result)`` may reject results that should not be cached, such
+        as fallbacks after a model error.
+        """
+        results = self.get_many(analyzer, version, texts)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            computed = compute([texts[index] for index in missing])
+            stored = []
+            for index, result in zip(missing, computed):
+                results[index] = result
+                if keep is None or keep(result):
+                    stored.append((texts[index], result))
+            self.put_many(
+                analyzer,
+                version,
+                [text for text, _result in stored],
+                [result for _text, result in stored],
+            )
+        return results
+
+    def stats(self) -> dict[str, int]:
+        return dict(sorted(self.metrics.items()))
+
+    def close(self) -> None:
+        """Prune long-unused rows and close the database."""
+        with self.lock:
+            if self.connection is None:
+                return
+            days = int(os.getenv("NEWS_ANALYSIS_CACHE_DAYS", "30") or 30)
+            cutoff = (datetime.date.today() - datetime.timedelta(days=days)).isoformat()
+            with self.connection:
+                self.connection.execute("DELETE FROM analysis WHERE used < ?", (cutoff,))
+            self.connection.close()
+            self.connection = None
+
+
+analysis_cache = AnalysisCache()
+
+
+# ── CACHED ANALYZERS ───────────────────────────────────────────────────────
+def cached_sentiments(pairs: list[tuple[str, str]]) -> list[dict]:
+    """``analyze_keywords_batch`` through the cache."""
+    texts = [f"{text}\0{context}" for text, context in pairs]
+    by_text = dict(zip(texts, pairs))
+    return analysis_cache.map(
+        "sentiment",
+        sentiment_version(),
+        texts,
+        lambda missing: analyze_keywords_batch([by_text[text] for text in missing]),
+        # Results without a method are fallbacks after a model error.
+        keep=lambda result: bool(result.get("method")),
+    )
+
+
+def cached_entities(texts: list[str]) -> list[list[str]]:
+    """``extract_entities`` for each text, through the cache."""
+    return analysis_cache.map(
+        "entities",
+        entities_version(),
+        texts,
+        lambda missing: [extract_entities(text) for text in missing],
+    )
+
+
+def cached_bias(article_text: str, headline: str = "", allow_remote: bool = True) -> dict:
+    """``analyze_political_bias`` through the cache.
+
+    Gemini and rule results are cached separately, so a Gemini outage that
+    falls back to the rules never hides a later Gemini answer.
+    """
+    text = f"{headline}\0{article_text}"
+    if allow_remote and gemini_bias_enabled():
+        analyzer, version = "bias_gemini", gemini_bias_version()
+    else:
+        analyzer, version = "bias_rules", rule_bias_version()
+    cached = analysis_cache.get(analyzer, version, text)
+    if cached is not None:
+        return cached
+
+    result = analyze_political_bias(article_text, headline, allow_remote=allow_remote)
+    if str(result.get("bias_method", "")).startswith("gemini_"):
+        analysis_cache.put("bias_gemini", gemini_bias_version(), text, result)
+    else:
+        analysis_cache.put("bias_rules", rule_bias_version(), text, result)
+    return result
+
+
+def cached_gemini_bias(article_text: str, headline: str = "") -> tuple[dict, bool]:
+    """Gemini-only bias through the cache, and whether it was a cache hit."""
+    text = f"{headline}\0{article_text}"
+    cached = analysis_cache.get("bias_gemini", gemini_bias_version(), text)
+    if cached is not None:
+        return cached, True
+    result = analyze_political_bias_with_gemini(article_text, headline)
+    analysis_cache.put("bias_gemini", gemini_bias_version(), text, result)
+    return result, False
+
+
+# ── ANALYZER VERSIONS ──────────────────────────────────────────────────────
+# Documents carry the versions they were computed with in
+# ``analyzer_versions``; cleanup_articles re-scores only mismatches.
+FULL_BIAS_METHODS = ("gemini_", "full_article_")
+
+
+def analyzer_versions(bias_method: str | None = None) -> dict[str, str]:
+    """Current version of each analyzer; ``bias`` follows ``bias_method``."""
+    gemini = str(bias_method or "").startswith("gemini_")
+    return {
+        "cleaner": RULES_VERSION,
+        "sentiment": sentiment_version(),
+        "entities": entities_version(),
+        "bias": gemini_bias_version() if gemini else rule_bias_version(),
+    }
+
+
+def stale_analysis_query(versions: dict[str, str]) -> dict:
+    """Mongo filter for documents any analyzer would now score differently.
+
+    Bias from Gemini or from the full article is never stale here: cleanup
+    only has the summary, and re-scoring it would be a downgrade.
+    """
+    return {
+        "$or": [
+            {"analyzer_versions.cleaner": {"$ne": versions["cleaner"]}},
+            {"analyzer_versions.sentiment": {"$ne": versions["sentiment"]}},
+            {"analyzer_versions.entities": {"$ne": versions["entities"]}},
+            {
+                "analyzer_versions.bias": {"$ne": versions["bias"]},
+                "bias_method": {"$not": {"$regex": f"^(?:{'|'.join(FULL_BIAS_METHODS)})"}},
+            },
+        ]
+    }
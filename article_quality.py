@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import hashlib
+import os
 import re
 from datetime import datetime, timedelta, timezone
-from urllib.parse import urlparse
+from functools import lru_cache, wraps
 
 
 JUNK_PATTERNS = [
@@ -125,86 +127,270 @@ def repair_joined_quotes(text: str | None) -> str:
     return "".join(repaired)
 
 
+class RuleMatcher:
+    """Tables of search patterns merged into one regex, one named group per rule.
+
+    ``match`` scans the text once and names the rule behind the leftmost hit
+    (the earliest listed on ties) as ``"TABLE: pattern"``, or returns None.
+    """
+
+    def __init__(self, tables: dict[str, list[str]], flags: int = re.I, literal: bool = False):
+        self.labels = [
+            f"{table}: {pattern}" for table, patterns in tables.items() for pattern in patterns
+        ]
+        sources = [
+            re.escape(pattern) if literal else pattern
+            for patterns in tables.values()
+            for pattern in patterns
+        ]
+        self.regex = re.compile(
+            "|".join(f"(?P<r{index}>{source})" for index, source in enumerate(sources)),
+            flags,
+        )
+
+    def match(self, text: str) -> str | None:
+        found = self.regex.search(text)
+        if found is None:
+            return None
+        group = found.lastgroup
+        if group is None or not group.startswith("r"):
+            group = next(name for name, value in found.groupdict().items() if value is not None)
+        return self.labels[int(group[1:])]
+
+    def __call__(self, text: str) -> bool:
+        return self.regex.search(text) is not None
+
+
+class SubstitutionStage:
+    """Ordered ``re.sub`` rules that share one detection scan.
+
+    The rules are merged into a single alternation; when it finds nothing,
+    none of the rules could change the text and all of them are skipped.
+    Otherwise they run in their original order, so output is identical to
+    applying each ``re.sub`` in turn.
+    """
+
+    def __init__(self, rules: list[tuple[str, str, int]]):
+        self.rules = [(re.compile(pattern, flags), repl) for pattern, repl, flags in rules]
+        self.detect = re.compile(
+            "|".join(
+                f"(?i:{pattern})" if flags & re.I else f"(?:{pattern})"
+                for pattern, _repl, flags in rules
+            )
+        )
+
+    def __call__(self, text: str) -> str:
+        if not self.detect.search(text):
+            return text
+        for pattern, repl in self.rules:
+            text = pattern.sub(repl, text)
+        return text
+
+
+class TextCleaner:
+    """Precompiled implementation of the module's cleaning functions."""
+
+    def __init__(self):
+        self.compact_stage = SubstitutionStage([
+            # Equivalent to \s+ -> " ", minus the no-op single spaces that
+            # would make every string look dirty.
+            (r"\s{2,}|[^\S ]", " ", 0),
+            (r"\s+([.,!?;:])", r"\1", 0),
+            (r"\b([A-Z])\.\s+([A-Z])\.", r"\1.\2.", 0),
+            (r"([.!?])([A-Z])", r"\1 \2", 0),
+            (r"([a-z])([A-Z][a-z])", r"\1 \2", 0),
+        ])
+        self.headline_stage = SubstitutionStage([
+            (r"^(?:Analysis\s+)?For Subscribers\s+", "", re.I),
+            (r"^Analysisby\s+[A-Z][A-Za-z'-]+\s+[A-Z][A-Za-z'-]+\s+", "", 0),
+            (r"\b(double|single)\s*quotation\s*mark", "", re.I),
+            ("‘ ", "‘", 0),
+            (r"\s*\d+\s+min\s+read.*$", "", re.I),
+            (r"\s*From The Athletic.*$", "", re.I),
+            (r"\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4}\s+for\s+The\s+New\s+York\s+Times$", "", 0),
+        ])
+        self.prefix_stage = SubstitutionStage(
+            [(pattern, "", re.I) for pattern in BOILERPLATE_PREFIXES]
+        )
+        self.inline_stage = SubstitutionStage(
+            [(pattern, " ", re.I) for pattern in INLINE_BOILERPLATE]
+        )
+        self.sentence_boilerplate = RuleMatcher(
+            {"SENTENCE_BOILERPLATE": SENTENCE_BOILERPLATE}, flags=0, literal=True
+        )
+        self.sentence_split = re.compile(r"(?<=[.!?])\s+")
+        self.trailing_initial = re.compile(r"(?:,\s*)?\b[A-Z]\.$")
+        self.terminal_punctuation = re.compile(r"[.!?]$")
+        self.ends_with_initial = re.compile(r"\b[A-Z]\.$")
+
+    def compact(self, text: str | None) -> str:
+        text = text or ""
+        if '"' in text or "'" in text:
+            text = repair_joined_quotes(text)
+        return self.compact_stage(text).strip()
+
+    def headline(self, headline: str | None) -> str:
+        return self.compact(self.headline_stage(self.compact(headline)))
+
+    def article(self, text: str | None) -> str:
+        cleaned = self.inline_stage(self.prefix_stage(self.compact(text)))
+        sentences = self.sentence_split.split(cleaned)
+        if self.sentence_boilerplate(cleaned.lower()):
+            sentences = [
+                sentence
+                for sentence in sentences
+                if not self.sentence_boilerplate(sentence.lower())
+            ]
+        return self.trim_trailing(
+            self.compact(" ".join(sentence for sentence in sentences if sentence))
+        )
+
+    def trim_trailing(self, text: str) -> str:
+        if not text:
+            return ""
+        text = self.trailing_initial.sub("", text).strip()
+        sentences = self.sentence_split.split(text)
+        if not sentences:
+            return text
+
+        last = sentences[-1].strip()
+        if len(sentences) > 1 and (
+            not self.terminal_punctuation.search(last)
+            or self.ends_with_initial.search(last)
+            or len(last.split()) <= 3
+        ):
+            sentences = sentences[:-1]
+        return self.compact(" ".join(sentences))
+
+
+text_cleaner = TextCleaner()
+
+
+# ── MEMOIZATION ─────────────────────────────────────────────────────────────
+# The same headline is cleaned by the listing filter, the pipeline, save2db,
+# cleanup_articles and the API. These functions are pure, so each process
+# pays for a given input once. Keys include RULES_VERSION. Full article
+# bodies are cleaned once per run anyway, so inputs longer than
+# TEXT_CACHE_MAX_CHARS bypass the cache instead of pinning megabytes of text.
+TEXT_CACHE_SIZE = int(os.getenv("NEWS_TEXT_CACHE_SIZE", "8192") or 0)
+TEXT_CACHE_MAX_CHARS = int(os.getenv("NEWS_TEXT_CACHE_MAX_CHARS", "2048") or 2048)
+# Bump when cleaning behaviour changes in code rather than in a pattern table.
+CLEANER_REVISION = 1
+_memoized = {}
+
+
+def memoized(func):
+    cached = lru_cache(maxsize=TEXT_CACHE_SIZE)(
+        lambda _version, *args, **kwargs: func(*args, **kwargs)
+    )
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if any(
+            isinstance(value, str) and len(value) > TEXT_CACHE_MAX_CHARS
+            for value in (*args, *kwargs.values())
+        ):
+            wrapper.uncached += 1
+            return func(*args, **kwargs)
+        return cached(RULES_VERSION, *args, **kwargs)
+
+    wrapper.uncached = 0
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    _memoized[func.__name__] = wrapper
+    return wrapper
+
+
+def cleaning_cache_stats() -> dict[str, dict[str, int]]:
+    """Hit/miss counters of the memoized cleaning functions."""
+    stats = {}
+    for name, func in _memoized.items():
+        info = func.cache_info()
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "uncached": func.uncached,
+        }
+    return stats
+
+
+@memoized
 def compact_text(text: str | None) -> str:
-    text = repair_joined_quotes(text)
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"\s+([.,!?;:])", r"\1", text)
-    text = re.sub(r"\b([A-Z])\.\s+([A-Z])\.", r"\1.\2.", text)
-    text = re.sub(r"([.!?])([A-Z])", r"\1 \2", text)
-    text = re.sub(r"([a-z])([A-Z][a-z])", r"\1 \2", text)
-    return text.strip()
+    return text_cleaner.compact(text)
 
 
+@memoized
 def clean_headline(headline: str | None) -> str:
-    text = compact_text(headline)
-    text = re.sub(r"^(?:Analysis\s+)?For Subscribers\s+", "", text, flags=re.I)
-    text = re.sub(
-        r"^Analysisby\s+[A-Z][A-Za-z'-]+\s+[A-Z][A-Za-z'-]+\s+",
-        "",
-        text,
-    )
-    text = re.sub(r"\b(double|single)\s*quotation\s*mark", "", text, flags=re.I)
-    text = text.replace("‘ ", "‘").replace(" “", " “")
-    text = re.sub(r"\s*\d+\s+min\s+read.*$", "", text, flags=re.I)
-    text = re.sub(r"\s*From The Athletic.*$", "", text, flags=re.I)
-    text = re.sub(r"\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4}\s+for\s+The\s+New\s+York\s+Times$", "", text)
-    return compact_text(text)
+    return text_cleaner.headline(headline)
 
 
+@memoized
 def clean_article_text(text: str | None) -> str:
-    cleaned = compact_text(text)
-    for pattern in BOILERPLATE_PREFIXES:
-        cleaned = re.sub(pattern, "", cleaned, flags=re.I)
-    for pattern in INLINE_BOILERPLATE:
-        cleaned = re.sub(pattern, " ", cleaned, flags=re.I)
-
-    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
-    sentences = [
-        sentence
-        for sentence in sentences
-        if sentence
-        and not any(fragment in sentence.lower() for fragment in SENTENCE_BOILERPLATE)
-    ]
-    return trim_incomplete_trailing_sentence(compact_text(" ".join(sentences)))
+    return text_cleaner.article(text)
 
 
 def trim_incomplete_trailing_sentence(text: str) -> str:
-    if not text:
-        return ""
-    text = re.sub(r"(?:,\s*)?\b[A-Z]\.$", "", text).strip()
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    if not sentences:
-        return text
-
-    last = sentences[-1].strip()
-    if len(sentences) > 1 and (
-        not re.search(r"[.!?]$", last)
-        or re.search(r"\b[A-Z]\.$", last)
-        or len(last.split()) <= 3
-    ):
-        sentences = sentences[:-1]
-    return compact_text(" ".join(sentences))
+    return text_cleaner.trim_trailing(text)
+
+
+JUNK_FRAGMENTS = ["work for us", "sign up for our email"]
+
+HEADLINE_RULES = RuleMatcher({
+    "JUNK_PATTERNS": JUNK_PATTERNS,
+    "BYLINE_ONLY_PATTERNS": BYLINE_ONLY_PATTERNS,
+})
+URL_RULES = RuleMatcher({
+    "JUNK_URL_PATTERNS": JUNK_URL_PATTERNS,
+    # Same test as urlparse(url).path: skip scheme and host, stop at ?query/#fragment.
+    # The lookahead plus backreference acts as an atomic group, so the host
+    # can't be re-read as part of the path.
+    "URL_PATH": [
+        r"^(?=(?P<url_head>(?:[a-z][a-z0-9+.-]*:)?(?://[^/?#]*)?))(?P=url_head)"
+        r"[^?#]*/(?:video|games|play|puzzle|crossword)"
+    ],
+})
+FRAGMENT_RULES = RuleMatcher({"JUNK_FRAGMENTS": JUNK_FRAGMENTS}, flags=0, literal=True)
+
+
+@memoized
+def classify_junk(
+    headline: str | None, url: str | None = "", summary: str | None = ""
+) -> str | None:
+    """Name the rule that makes an entry junk, or None for a real article.
+
+    Each field is scanned once: the headline against the junk and byline
+    tables, the URL against the URL and path tables, and headline plus
+    summary against the literal fragments.
+    """
+    title = compact_text(headline)
+    if len(title.split()) < 4:
+        return "SHORT_HEADLINE"
+    return (
+        HEADLINE_RULES.match(title)
+        or URL_RULES.match(url or "")
+        or FRAGMENT_RULES.match(f"{title.lower()} {compact_text(summary).lower()}")
+    )
 
 
 def is_junk_article(headline: str | None, url: str | None = "", summary: str | None = "") -> bool:
-    title = compact_text(headline).lower()
-    body = compact_text(summary).lower()
-    path = urlparse(url or "").path.lower()
-    combined = f"{title} {body}"
+    return classify_junk(headline, url, summary) is not None
 
-    if len(title.split()) < 4:
-        return True
-    if any(re.search(pattern, title, re.I) for pattern in JUNK_PATTERNS):
-        return True
-    if any(re.search(pattern, url or "", re.I) for pattern in JUNK_URL_PATTERNS):
-        return True
-    if any(re.search(pattern, compact_text(headline), re.I) for pattern in BYLINE_ONLY_PATTERNS):
-        return True
-    if any(pattern.lower() in combined for pattern in ["work for us", "sign up for our email"]):
-        return True
-    if re.search(r"/(video|games|play|puzzle|crossword)", path):
-        return True
-    return False
+
+def rules_fingerprint() -> str:
+    """Hash of every compiled cleaning and junk rule plus CLEANER_REVISION."""
+    sources = [str(CLEANER_REVISION)]
+    for part in (*vars(text_cleaner).values(), HEADLINE_RULES, URL_RULES, FRAGMENT_RULES):
+        if isinstance(part, SubstitutionStage):
+            sources.extend(f"{pattern.pattern}\t{repl}" for pattern, repl in part.rules)
+        elif isinstance(part, RuleMatcher):
+            sources.append(part.regex.pattern)
+        elif isinstance(part, re.Pattern):
+            sources.append(part.pattern)
+    return hashlib.sha256("\n".join(sources).encode("utf-8")).hexdigest()[:12]
+
+
+RULES_VERSION = rules_fingerprint()
 
 
 def is_recent(timestamp, days: int = 2) -> bool:
@@ -7,7 +7,8 @@ import time
 from dotenv import load_dotenv
 from pymongo import MongoClient
 
-from political_bias import analyze_political_bias_with_gemini
+from analysis_cache import analysis_cache, cached_gemini_bias
+from political_bias import gemini_bias_version
 from sentiment_analysis_pipeline import fetch_full_article
 
 
@@ -59,9 +60,7 @@ def main():
         else:
             source = "full article"
 
-        result = analyze_political_bias_with_gemini(
-            content, article.get("headline", "")
-        )
+        result, cached = cached_gemini_bias(content, article.get("headline", ""))
         if source == "summary fallback":
             result["bias_method"] = result["bias_method"].replace(
                 "full_article", "summary_fallback"
@@ -69,15 +68,22 @@ def main():
         analyzed += 1
         print(
             f"{result['bias'].upper():8} {result['bias_score']:+.2f} "
-            f"{article.get('headline', 'Untitled')} [{source}]"
+            f"{article.get('headline', 'Untitled')} [{source}{', cached' if cached else ''}]"
         )
         if not args.dry_run:
-            collection.update_one({"_id": article["_id"]}, {"$set": result})
+            # Stamp the Gemini version with the result, as the pipeline does.
+            collection.update_one(
+                {"_id": article["_id"]},
+                {"$set": {**result, "analyzer_versions.bias": gemini_bias_version()}},
+            )
         # The Gemini free tier currently permits 15 requests/minute. Stay below
         # that ceiling by default; paid projects can lower this delay.
-        time.sleep(float(os.getenv("BIAS_BACKFILL_DELAY", "4.2")))
+        if not cached:
+            time.sleep(float(os.getenv("BIAS_BACKFILL_DELAY", "4.2")))
 
     print(f"Analyzed {analyzed}; skipped {skipped}; dry_run={args.dry_run}")
+    print("♻️ Analysis cache:", analysis_cache.stats())
+    analysis_cache.close()
 
 
 if __name__ == "__main__":
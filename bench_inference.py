@@ -0,0 +1,88 @@
+"""Compare the PyTorch and quantized ONNX backends for the transformer models.
+
+    python bench_inference.py --summaries 8
+
+Every headline/summary pair in ``sentiment_results.json`` is classified by
+the sentiment model on both backends (the keyword rules are skipped so every
+item reaches the model). The script reports label agreement and articles per
+second, then times ``--summaries`` t5 summaries the same way. Requires
+``optimum[onnxruntime]``; ``NEWS_ONNX_THREADS`` applies to the ONNX side.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+from bench_text_cleaning import load_corpus
+from feed_data import DEFAULT_SENTIMENT_MODEL, _model_result
+from onnx_backend import onnx_threads, sentiment_pipeline, summarization_pipeline
+
+SUMMARY_MODEL = "t5-large"
+
+
+def _timed(func, inputs: list[str], **kwargs):
+    start = time.perf_counter()
+    outputs = func(inputs, **kwargs)
+    return outputs, time.perf_counter() - start
+
+
+def _rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:.1f} articles/s" if seconds else "n/a"
+
+
+def compare_sentiment(texts: list[str], batch_size: int) -> None:
+    from transformers import pipeline
+
+    model_name = os.getenv("SENTIMENT_MODEL_NAME", DEFAULT_SENTIMENT_MODEL)
+    backends = {
+        "torch": pipeline("sentiment-analysis", model=model_name, device=-1),
+        "onnx": sentiment_pipeline(model_name),
+    }
+    labels = {}
+    for name, model in backends.items():
+        model(texts[:batch_size], batch_size=batch_size, truncation=True)  # warm-up
+        predictions, seconds = _timed(model, texts, batch_size=batch_size, truncation=True)
+        labels[name] = [_model_result(p)["final_sentiment"] for p in predictions]
+        print(f"⏱️ sentiment {name}: {_rate(len(texts), seconds)}")
+
+    agree = sum(a == b for a, b in zip(labels["torch"], labels["onnx"]))
+    print(f"📊 sentiment label agreement: {agree}/{len(texts)} ({agree / len(texts):.1%})")
+
+
+def compare_summaries(texts: list[str]) -> None:
+    from transformers import pipeline
+
+    backends = {
+        "torch": pipeline("summarization", model=SUMMARY_MODEL, device=-1),
+        "onnx": summarization_pipeline(SUMMARY_MODEL),
+    }
+    inputs = ["summarize: " + text[:2048] for text in texts]
+    outputs = {}
+    for name, model in backends.items():
+        results, seconds = _timed(model, inputs, min_length=50, do_sample=False)
+        outputs[name] = [result["summary_text"] for result in results]
+        print(f"⏱️ summaries {name}: {_rate(len(texts), seconds)}")
+
+    identical = sum(a == b for a, b in zip(outputs["torch"], outputs["onnx"]))
+    print(f"📊 identical summaries: {identical}/{len(texts)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--summaries", type=int, default=8, help="texts to summarize (0 skips)")
+    parser.add_argument("--pages", type=int, default=0, help="HTML store pages to add")
+    args = parser.parse_args()
+
+    headlines, texts = load_corpus(pages=args.pages)
+    pairs = [f"{h}. {t}".strip()[:512] for h, t in zip(headlines, texts)]
+    print(f"🧵 ONNX Runtime threads: {onnx_threads()}; {len(pairs)} articles")
+    compare_sentiment(pairs, args.batch_size)
+    if args.summaries:
+        long_texts = [text for text in texts if len(text.split()) >= 10]
+        compare_summaries(long_texts[: args.summaries])
+
+
+if __name__ == "__main__":
+    main()
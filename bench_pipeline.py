@@ -0,0 +1,94 @@
+"""End-to-end pipeline timing against recorded HTTP traffic.
+
+Record once with network access, then benchmark anywhere offline:
+
+    python bench_pipeline.py record
+    python bench_pipeline.py replay --runs 3 --latency 40
+
+Every run uses a fresh run cache and working directory, so validators,
+the processed-URL index and the HTML store never short-circuit the work
+being measured. MongoDB is never touched. Keep the same model/Gemini
+environment for recording and replay, or runs will take different paths.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_once(mode: str, fixtures: str, latency: str) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            "NEWS_HTTP_REPLAY": mode,
+            "NEWS_HTTP_FIXTURES": fixtures,
+            "NEWS_HTTP_REPLAY_LATENCY": latency,
+            "NEWS_CACHE_DIR": os.path.join(workdir, ".news_cache"),
+            "MONGO_URL": "",
+        }
+        # Each run gets its own interpreter so module-level caches start cold.
+        code = (
+            "import json, os, sys, time\n"
+            f"sys.path.insert(0, {ROOT!r})\n"
+            f"os.chdir({ROOT!r})\n"
+            "import sentiment_analysis_pipeline as pipeline\n"
+            f"os.chdir({workdir!r})\n"
+            "start = time.perf_counter()\n"
+            "pipeline.process_news()\n"
+            "elapsed = time.perf_counter() - start\n"
+            "with open('sentiment_results.json', encoding='utf-8') as f:\n"
+            "    articles = sum(len(v) for v in json.load(f).values())\n"
+            "print('BENCH', json.dumps({'seconds': elapsed, 'articles': articles,\n"
+            "      'fetches': dict(pipeline.fetch_metrics)}))\n"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            env={**os.environ, **env},
+            stdout=subprocess.PIPE,
+            text=True,
+            check=True,
+        ).stdout
+    line = next(line for line in output.splitlines() if line.startswith("BENCH "))
+    return json.loads(line[len("BENCH "):])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument(
+        "--latency",
+        default="",
+        help="milliseconds added per replayed response, or 'recorded'",
+    )
+    parser.add_argument(
+        "--fixtures",
+        default=os.getenv("NEWS_HTTP_FIXTURES", os.path.join(ROOT, "http_fixtures")),
+    )
+    args = parser.parse_args()
+    fixtures = os.path.abspath(args.fixtures)
+
+    runs = []
+    for number in range(1, (1 if args.mode == "record" else args.runs) + 1):
+        result = run_once(args.mode, fixtures, args.latency)
+        runs.append(result)
+        print(
+            f"⏱️ run {number}: {result['seconds']:.2f}s, "
+            f"{result['articles']} articles, fetches {result['fetches']}"
+        )
+    if len(runs) > 1:
+        seconds = [run["seconds"] for run in runs]
+        print(
+            f"📊 median {statistics.median(seconds):.2f}s, "
+            f"min {min(seconds):.2f}s, max {max(seconds):.2f}s over {len(runs)} runs"
+        )
+
+
+if __name__ == "__main__":
+    main()
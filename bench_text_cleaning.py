@@ -0,0 +1,160 @@
+"""Compare ``article_quality``'s cleaners with the per-call ``re.sub`` versions.
+
+    python bench_text_cleaning.py --repeat 20
+
+The corpus is every headline and summary in ``sentiment_results.json`` plus
+the raw text of pages in the HTML store (``--pages``). Each input goes
+through both implementations; any output difference is reported and fails
+the run before timings are printed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+
+from article_quality import (
+    BOILERPLATE_PREFIXES,
+    INLINE_BOILERPLATE,
+    SENTENCE_BOILERPLATE,
+    clean_article_text,
+    clean_headline,
+    compact_text,
+    repair_joined_quotes,
+    text_cleaner,
+)
+
+
+# ── LEGACY REFERENCE (article_quality before TextCleaner) ────────────────────
+def legacy_compact_text(text: str | None) -> str:
+    text = repair_joined_quotes(text)
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\s+([.,!?;:])", r"\1", text)
+    text = re.sub(r"\b([A-Z])\.\s+([A-Z])\.", r"\1.\2.", text)
+    text = re.sub(r"([.!?])([A-Z])", r"\1 \2", text)
+    text = re.sub(r"([a-z])([A-Z][a-z])", r"\1 \2", text)
+    return text.strip()
+
+
+def legacy_clean_headline(headline: str | None) -> str:
+    text = legacy_compact_text(headline)
+    text = re.sub(r"^(?:Analysis\s+)?For Subscribers\s+", "", text, flags=re.I)
+    text = re.sub(
+        r"^Analysisby\s+[A-Z][A-Za-z'-]+\s+[A-Z][A-Za-z'-]+\s+",
+        "",
+        text,
+    )
+    text = re.sub(r"\b(double|single)\s*quotation\s*mark", "", text, flags=re.I)
+    text = text.replace("‘ ", "‘").replace(" “", " “")
+    text = re.sub(r"\s*\d+\s+min\s+read.*$", "", text, flags=re.I)
+    text = re.sub(r"\s*From The Athletic.*$", "", text, flags=re.I)
+    text = re.sub(r"\s*[A-Z][a-z]+(?:\s+[A-Z][a-z]+){1,4}\s+for\s+The\s+New\s+York\s+Times$", "", text)
+    return legacy_compact_text(text)
+
+
+def legacy_clean_article_text(text: str | None) -> str:
+    cleaned = legacy_compact_text(text)
+    for pattern in BOILERPLATE_PREFIXES:
+        cleaned = re.sub(pattern, "", cleaned, flags=re.I)
+    for pattern in INLINE_BOILERPLATE:
+        cleaned = re.sub(pattern, " ", cleaned, flags=re.I)
+
+    sentences = re.split(r"(?<=[.!?])\s+", cleaned)
+    sentences = [
+        sentence
+        for sentence in sentences
+        if sentence
+        and not any(fragment in sentence.lower() for fragment in SENTENCE_BOILERPLATE)
+    ]
+    return legacy_trim_incomplete_trailing_sentence(legacy_compact_text(" ".join(sentences)))
+
+
+def legacy_trim_incomplete_trailing_sentence(text: str) -> str:
+    if not text:
+        return ""
+    text = re.sub(r"(?:,\s*)?\b[A-Z]\.$", "", text).strip()
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    if not sentences:
+        return text
+
+    last = sentences[-1].strip()
+    if len(sentences) > 1 and (
+        not re.search(r"[.!?]$", last)
+        or re.search(r"\b[A-Z]\.$", last)
+        or len(last.split()) <= 3
+    ):
+        sentences = sentences[:-1]
+    return legacy_compact_text(" ".join(sentences))
+
+
+# ── BENCHMARK ───────────────────────────────────────────────────────────────
+def load_corpus(results_file: str = "sentiment_results.json", pages: int = 0):
+    """Return ``(headlines, texts)`` to clean."""
+    with open(results_file, "r", encoding="utf-8") as f:
+        records = [record for group in json.load(f).values() for record in group]
+    headlines = [record.get("headline") or "" for record in records]
+    texts = [record.get("summary") or "" for record in records]
+    if pages:
+        from article_extract import extract_article
+        from html_store import html_store
+
+        for count, (_url, _fetched, content) in enumerate(html_store.iter_pages()):
+            if count >= pages:
+                break
+            texts.append(extract_article(content)[0])
+    return headlines, texts
+
+
+def mismatches(headlines, texts) -> list[tuple[str, str, str, str]]:
+    found = []
+    for name, new, old, inputs in (
+        ("compact_text", compact_text, legacy_compact_text, headlines + texts),
+        ("clean_headline", clean_headline, legacy_clean_headline, headlines),
+        ("clean_article_text", clean_article_text, legacy_clean_article_text, texts),
+    ):
+        for value in inputs:
+            if new(value) != old(value):
+                found.append((name, value, new(value), old(value)))
+    return found
+
+
+def _time(func, inputs, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            func(value)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=200, help="HTML store pages to add")
+    args = parser.parse_args()
+
+    headlines, texts = load_corpus(pages=args.pages)
+    diffs = mismatches(headlines, texts)
+    for name, value, new, old in diffs[:10]:
+        print(f"❌ {name} differs for {value[:80]!r}:\n   new {new[:120]!r}\n   old {old[:120]!r}")
+    if diffs:
+        raise SystemExit(f"{len(diffs)} outputs differ")
+    print(f"✅ identical output on {len(headlines)} headlines and {len(texts)} texts")
+
+    # Time the uncached TextCleaner methods; the public functions are
+    # memoized and would only measure cache hits after the first repeat.
+    for name, new, old, inputs in (
+        ("clean_headline", text_cleaner.headline, legacy_clean_headline, headlines),
+        ("clean_article_text", text_cleaner.article, legacy_clean_article_text, texts),
+    ):
+        legacy = _time(old, inputs, args.repeat)
+        current = _time(new, inputs, args.repeat)
+        calls = len(inputs) * args.repeat
+        print(
+            f"⏱️ {name}: {legacy / calls * 1e6:.1f}µs -> {current / calls * 1e6:.1f}µs "
+            f"per call ({legacy / current:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Request patterns dropped by Network.setBlockedURLs for each NEWS_BROWSER_BLOCK
+# category. Headline listings only need the document and its scripts.
+BLOCKED_RESOURCES = {
+    "images": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3"],
+    "ads": [
+        "*doubleclick.net*",
+        "*googlesyndication.com*",
+        "*googletagservices.com*",
+        "*googletagmanager.com*",
+        "*amazon-adsystem.com*",
+        "*adnxs.com*",
+        "*taboola.com*",
+        "*outbrain.com*",
+        "*scorecardresearch.com*",
+        "*chartbeat.com*",
+    ],
+}
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in {"1", "true", "yes"}
+
+
+def blocked_categories() -> list[str]:
+    value = os.getenv("NEWS_BROWSER_BLOCK", "images,fonts,media,ads")
+    return [item.strip() for item in value.split(",") if item.strip() in BLOCKED_RESOURCES]
+
+
+def browser_options() -> webdriver.EdgeOptions:
+    options = webdriver.EdgeOptions()
+    if _env_flag("NEWS_BROWSER_HEADLESS", "1"):
+        options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--window-size=1366,900")
+    # "eager" returns once the DOM is parsed instead of waiting for every
+    # subresource; WebDriverWait still waits for the headline XPath.
+    options.page_load_strategy = os.getenv("NEWS_BROWSER_PAGE_LOAD", "eager")
+    if "images" in blocked_categories():
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+    return options
+
+
+class DriverPool:
+    """Run-wide pool of browser sessions for dynamic listing pages.
+
+    A driver is recycled after ``max_pages`` page loads or as soon as it
+    raises anything other than a wait timeout, so a crashed or bloated
+    browser never serves the next site.
+    """
+
+    def __init__(self, size: int | None = None, max_pages: int | None = None):
+        self.size = max(1, size or int(os.getenv("NEWS_BROWSER_POOL_SIZE", "1") or 1))
+        self.max_pages = max(
+            1, max_pages or int(os.getenv("NEWS_BROWSER_MAX_PAGES", "20") or 20)
+        )
+        self.slots = threading.BoundedSemaphore(self.size)
+        self.idle: list = []
+        self.pages: dict[int, int] = {}
+        self.lock = threading.Lock()
+
+    def _start(self):
+        driver = webdriver.Edge(options=browser_options())
+        driver.set_page_load_timeout(int(os.getenv("NEWS_BROWSER_PAGE_TIMEOUT", "45")))
+        patterns = [
+            pattern
+            for category in blocked_categories()
+            for pattern in BLOCKED_RESOURCES[category]
+        ]
+        if patterns:
+            try:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            except WebDriverException as e:
+                print(f"⚠️ Browser resource blocking unavailable: {e}")
+        return driver
+
+    @staticmethod
+    def _quit(driver) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def driver(self):
+        self.slots.acquire()
+        try:
+            with self.lock:
+                driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                driver = self._start()
+            healthy = True
+            try:
+                yield driver
+            except TimeoutException:
+                raise
+            except WebDriverException:
+                healthy = False
+                raise
+            finally:
+                with self.lock:
+                    pages = self.pages.get(id(driver), 0) + 1
+                    self.pages[id(driver)] = pages
+                    recycle = not healthy or pages >= self.max_pages
+                    if recycle:
+                        self.pages.pop(id(driver), None)
+                    else:
+                        self.idle.append(driver)
+                if recycle:
+                    self._quit(driver)
+        finally:
+            self.slots.release()
+
+    def close(self) -> None:
+        with self.lock:
+            drivers, self.idle = self.idle, []
+            self.pages.clear()
+        for driver in drivers:
+            self._quit(driver)
+
+
+driver_pool = DriverPool()
+atexit.register(driver_pool.close)
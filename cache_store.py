@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+# Run-to-run state (HTTP validators, indexes, stats) lives here. The scheduled
+# workflow restores and saves this directory with actions/cache.
+CACHE_DIR = os.getenv("NEWS_CACHE_DIR", ".news_cache")
+
+_lock = threading.Lock()
+
+
+def cache_path(*parts: str) -> str:
+    path = os.path.join(CACHE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def load_json(name: str, default=None):
+    try:
+        with open(cache_path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Ignoring unreadable cache file {name}: {e}")
+        return default
+
+
+def save_json(name: str, data) -> None:
+    """Write ``data`` atomically so an interrupted run never leaves half a file."""
+    path = cache_path(name)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with _lock:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp, path)
@@ -4,12 +4,25 @@ import os
 from dotenv import load_dotenv
 from pymongo import DeleteOne, MongoClient, UpdateOne
 
-from article_quality import clean_article_text, clean_headline, is_junk_article
-from keyword_extractor import extract_entities
-from political_bias import analyze_political_bias
+from article_quality import (
+    clean_article_text,
+    clean_headline,
+    cleaning_cache_stats,
+    is_junk_article,
+)
 
 os.environ.setdefault("NEWS_PIPELINE_FAST", "1")
-from feed_data import analyze_keywords
+from analysis_cache import (
+    FULL_BIAS_METHODS,
+    analysis_cache,
+    analyzer_versions,
+    cached_bias,
+    cached_entities,
+    cached_sentiments,
+    stale_analysis_query,
+)
+
+BATCH_SIZE = 500
 
 
 def main():
@@ -20,73 +33,97 @@ def main():
     ][os.getenv("COLLECTION_NAME", "articles")]
     retention_days = max(1, int(os.getenv("ARTICLE_RETENTION_DAYS", "365")))
 
-    scanned = 0
-    deleted = 0
-    expired = 0
-    updated = 0
     recent_cutoff = datetime.now(timezone.utc) - timedelta(days=2)
     retention_cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
-    operations = []
 
-    for article in collection.find({}):
+    # Retention and freshness are plain queries; no document is read for them.
+    expired = collection.delete_many({"timestamp": {"$lt": retention_cutoff}}).deleted_count
+    collection.update_many(
+        {"timestamp": {"$lt": recent_cutoff}, "is_stale": {"$ne": True}},
+        {"$set": {"is_stale": True}},
+    )
+    collection.update_many(
+        {"timestamp": {"$not": {"$lt": recent_cutoff}}, "is_stale": {"$ne": False}},
+        {"$set": {"is_stale": False}},
+    )
+
+    # Only documents scored by an older analyzer version are re-scored.
+    versions = analyzer_versions()
+    scanned = 0
+    deleted = expired
+    updated = 0
+    operations = []
+    # Updates wait here until a batch is full so analysis runs in bulk.
+    pending = []
+
+    def flush_pending():
+        sentiments = cached_sentiments(
+            [(update["headline"], update["summary"]) for _id, update in pending]
+        )
+        entities = cached_entities(
+            [f"{update['headline']}. {update['summary']}" for _id, update in pending]
+        )
+        for (article_id, update), sentiment_result, names in zip(pending, sentiments, entities):
+            update["entities"] = names
+            update["sentiment"] = sentiment_result["final_sentiment"]
+            update["sentiment_method"] = sentiment_result.get("method")
+            update["sentiment_score"] = sentiment_result.get("score")
+            operations.append(UpdateOne({"_id": article_id}, {"$set": update}))
+        pending.clear()
+
+    for article in collection.find(stale_analysis_query(versions)):
         scanned += 1
         headline = clean_headline(article.get("headline"))
         summary = clean_article_text(article.get("summary"))
         url = article.get("url")
-        timestamp = article.get("timestamp")
-
-        if timestamp and timestamp.tzinfo is None:
-            timestamp = timestamp.replace(tzinfo=timezone.utc)
-
-        if timestamp and timestamp < retention_cutoff:
-            operations.append(DeleteOne({"_id": article["_id"]}))
-            deleted += 1
-            expired += 1
-            continue
 
         if is_junk_article(headline, url, summary):
             operations.append(DeleteOne({"_id": article["_id"]}))
             deleted += 1
             continue
 
-        sentiment_result = analyze_keywords(headline, summary)
         update = {
             "headline": headline,
             "summary": summary,
-            "sentiment": sentiment_result["final_sentiment"],
-            "sentiment_method": sentiment_result.get("method"),
-            "sentiment_score": sentiment_result.get("score"),
-            "entities": extract_entities(f"{headline}. {summary}"),
+            "analyzer_versions.cleaner": versions["cleaner"],
+            "analyzer_versions.sentiment": versions["sentiment"],
+            "analyzer_versions.entities": versions["entities"],
         }
 
-        # Never downgrade a full-article result during archive cleanup. Legacy
-        # records have only summaries, so mark their backfill method explicitly.
-        if not str(article.get("bias_method", "")).endswith("framing_v2"):
-            bias_result = analyze_political_bias(
-                summary, headline, allow_remote=False
-            )
+        # Never downgrade a Gemini or full-article result during archive
+        # cleanup. Legacy records have only summaries, so mark their backfill
+        # method explicitly.
+        stamps = article.get("analyzer_versions") or {}
+        if (
+            not str(article.get("bias_method", "")).startswith(FULL_BIAS_METHODS)
+            and stamps.get("bias") != versions["bias"]
+        ):
+            bias_result = cached_bias(summary, headline, allow_remote=False)
             bias_result["bias_method"] = "summary_framing_v2"
             update.update(bias_result)
+            update["analyzer_versions.bias"] = versions["bias"]
 
-        if timestamp and timestamp < recent_cutoff:
-            update["is_stale"] = True
-        else:
-            update["is_stale"] = False
-
-        operations.append(UpdateOne({"_id": article["_id"]}, {"$set": update}))
+        pending.append((article["_id"], update))
         updated += 1
 
-        if len(operations) >= 500:
+        if len(pending) >= BATCH_SIZE:
+            flush_pending()
+        if len(operations) >= BATCH_SIZE:
             collection.bulk_write(operations, ordered=False)
-            operations = []
+            operations.clear()
 
+    if pending:
+        flush_pending()
     if operations:
         collection.bulk_write(operations, ordered=False)
 
     print(
-        f"Scanned {scanned}; deleted {deleted} ({expired} expired after "
-        f"{retention_days} days); updated {updated}."
+        f"Re-scored {scanned} stale documents; deleted {deleted} ({expired} expired "
+        f"after {retention_days} days); updated {updated}."
     )
+    print("♻️ Text cleaning cache:", cleaning_cache_stats())
+    print("♻️ Analysis cache:", analysis_cache.stats())
+    analysis_cache.close()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,16 @@
+import hashlib
 import os
 import re
+import threading
+
+from onnx_backend import inference_backend
+from sentiment_linear import linear_decision, linear_version
 
 sentiment_model = None
+_model_lock = threading.Lock()
 DEFAULT_SENTIMENT_MODEL = "cardiffnlp/twitter-roberta-base-sentiment-latest"
+# Bump when classification changes in code; part of sentiment_version().
+SENTIMENT_REVISION = 1
 
 
 def _transformer_device():
@@ -29,21 +37,21 @@ NEGATIVE_KEYWORDS = [
     # ← newly added:
     "recession", "inflation", "flood", "hurricane", "earthquake", "drought", "pandemic",
     "epidemic", "outbreak", "poisoning", "recall", "evacuation", "holdup", "hijack",
-    "massacre", "genocide", "terrorist", "hostility", "embargo", "sanction", "boycott",
-    "glitch", "failure", "shutdown", "collapse", "flare-up", "flare up", "heatwave",
+    "massacre", "genocide", "terrorist", "hostility", "embargo", "sanction",
+    "glitch", "failure", "flare-up", "flare up", "heatwave",
     "heat wave", "wildfire", "firestorm", "storm", "blizzard", "tsunami", "avalanche",
     "landslide", "mudslide", "sinkhole", "tsunami warning", "warning", "alert",
-    "implosion", "lawsuit", "struck down", "halted", "blocked", "deadlock",
-    "layoffs", "fury", "outrage", "misconduct", "deadly", "plane crash", "tsunami",
-    "negligence", "shooting", "collapse", "explosion", "blast", "detonation", "detonated",
-    "detonating", "detonates", "detonated", "detonating", "detonates", "detonation",
-    "strike", "air strike", "air attack", "missile", "bomb", "bombardment",
+    "implosion", "struck down", "halted", "blocked", "deadlock",
+    "layoffs", "fury", "misconduct", "plane crash",
+    "negligence", "shooting", "blast", "detonation", "detonated",
+    "detonating", "detonates",
+    "air strike", "air attack", "bomb", "bombardment",
     "shelling", "air raid", "drone attack", "sabotage", "mass shooting",
-    "plane crash", "bus crash", "hostages", "kidnapped", "abduction", "kidnapping",
+    "bus crash", "hostages", "kidnapped", "abduction", "kidnapping",
     "abducted", "kidnap", "kidnapper", "kidnappers", "hostage crisis", "hostage situation","emergency",
     "emergency situation", "emergency response", "emergency services", "emergency alert", "car hits", "don't",
     "paedophile", "victims", "victim", "victimized", "victimization", "victimised",
-    "victimization", "victimised", "victimizing", "victimizes", "victimization", "devastated",
+    "victimizing", "victimizes", "devastated",
     "unleashed", "no peace", "can be no peace", "cannot be peace", "without peace"
 
 ]
@@ -62,21 +70,21 @@ POSITIVE_KEYWORDS = [
     "leadership", "revival", "renaissance", "renaissances", "renaissanced", "heroic",
     "historic", "groundbreaking", "landmark", "landmark event", "landmark decision",
     "landmark moment", "landmark legislation", "landmark ruling", "landmark agreement",
-    "wins", "wins award", "reinstated", "green-light", "record high", "revival",
-    "attracts", "reunion", "milestone", "innovation", "unveiled", "unveils", "launched",
+    "wins", "wins award", "reinstated", "green-light", "record high",
+    "attracts", "innovation", "unveiled", "unveils", "launched",
     "ceasefire", "peace talks", "de-escalation", "released", "rescued",
-    "reunited", "humanitarian aid", "donated", "record high", "record profit", "pleased",
+    "reunited", "humanitarian aid", "donated", "record profit", "pleased",
     "satisfied", "gratified", "elated", "joyful", "joyous", "exhilarated", "ecstatic", "thrilled",
-    "overjoyed", "delighted", "content", "contented", "fulfilled", "satisfied", "conquer", "conquered",
+    "overjoyed", "delighted", "content", "contented", "fulfilled", "conquer", "conquered",
     "conquers", "conquering", "victorious", "victory", "victories", "heroic act", "competition",
-    "championship", "championships", "champion", "champions", "tournament", "tournaments", "kick-boxing",
+    "championship", "championships", "tournament", "tournaments", "kick-boxing",
     "kickboxing", "boxing", "wrestling", "wrestler", "wrestlers", "wrestled", "wrestles", "robots", "remember", "remembered",
     "remembering", "remembrance", "commemorate", "commemorated", "commemorating", "celebration", "anniversary", "anniversaries",
-    "celebrates", "celebrated", "celebrating", "festival", "festivals", "carnival", "carnivals", "agrees", "agreement",
+    "celebrated", "celebrating", "festival", "festivals", "carnival", "carnivals", "agrees", "agreement",
     "agreed", "agreeing", "consensus", "consensual", "consensually", "consents", "consented", "consenting", "consent", "consents to", "consented to", "consenting to",
     "consent to", "consent for", "consents for", "consented for", "consenting for", "consent with", "consents with", "consented with", "consenting with",
     "hold up", "sold out", "sold-out", "soldout", "sold out event", "sold out show", "sold out concert",
-    "sold out performance", "sold out tour", "sold out festival", "sold out event",
+    "sold out performance", "sold out tour", "sold out festival",
 ]
 
 MIXED_KEYWORDS = [
@@ -85,7 +93,7 @@ MIXED_KEYWORDS = [
     # ← newly added:
     "questioned", "questioning", "scrutiny", "lines drawn", "standoff",
     "split", "splits", "tie", "tied", "tension", "tensions", "polarized", "polarization",
-    "polarise", "polarisation", "polarises", "polarising", "polarized", "polarizing",
+    "polarise", "polarisation", "polarises", "polarising", "polarizing",
     "emotional", "emotional reactions", "emotional response", "emotional responses",
     "emotional turmoil", "emotional rollercoaster", "emotional impact", "emotional fallout", "escapes", "controversial",
     "controversially", "controversies", "controversial issues", "controversial topic", "resigns", "resignation",
@@ -101,7 +109,7 @@ NEUTRAL_INDICATORS = [
     "analysis", "perspective", "review", "interview", "profile", "memo", "minutes",
     "live blog", "live", "coverage", "overview", "primer", "how-to", "guide", "factbox",
     "timeline", "timeline:", "explainer", "explanation", "thoughts", "thought",
-    "commentary", "briefing", "brief", "backgrounder", "background", "background:", "court"
+    "commentary", "briefing", "brief", "backgrounder", "background", "background:",
 ]
 
 STRONG_NEGATIVE_KEYWORDS = [
@@ -112,65 +120,234 @@ STRONG_NEGATIVE_KEYWORDS = [
 ]
 
 
-def _contains_phrase(text: str, phrases: list[str]) -> bool:
-    return any(re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", text) for phrase in phrases)
+class KeywordAutomaton:
+    """All keyword tables compiled into one trie-shaped regex.
 
-def analyze_keywords(text: str, context: str = "") -> dict:
-    """
-    Robust sentiment classifier using a hybrid of model + rules.
+    A lookahead ``finditer`` tries every position and, because the trie's
+    optional tails are greedy, returns the longest keyword starting there.
+    Every shorter keyword starting at the same position is a prefix of that
+    match, so each match maps to the categories of all its keyword prefixes.
+    One pass therefore reports every category with a substring hit.
+    Categories in ``bounded`` only count when the keyword is not part of a
+    longer word, like ``(?<!\\w)keyword(?!\\w)``.
     """
-    try:
-        full_text = f"{text}. {context}".strip()
-        lower_text = full_text.lower()
-        has_negative = any(word in lower_text for word in NEGATIVE_KEYWORDS)
-        has_positive = any(word in lower_text for word in POSITIVE_KEYWORDS)
-        has_mixed = any(w in lower_text for w in MIXED_KEYWORDS)
-        has_neutral = any(w in lower_text for w in NEUTRAL_INDICATORS)
-        has_strong_negative = _contains_phrase(lower_text, STRONG_NEGATIVE_KEYWORDS)
-
-        if has_strong_negative:
-            return {"final_sentiment": "negative", "method": "strong_negative_rules"}
-        if has_negative and not has_positive:
-            return {"final_sentiment": "negative", "method": "negative_rules"}
-        if (has_negative and has_positive) or has_mixed:
-            return {"final_sentiment": "neutral", "method": "mixed_rules"}
-        if has_neutral and not has_negative and not has_positive:
-            return {"final_sentiment": "neutral", "method": "neutral_rules"}
-
-        fast_sentiment = (
-            os.getenv("NEWS_SENTIMENT_FAST")
-            or os.getenv("NEWS_PIPELINE_FAST", "")
-        ).lower() in {"1", "true", "yes"}
-
-        if fast_sentiment:
-            if has_positive and not has_negative:
-                return {"final_sentiment": "positive", "method": "positive_rules"}
-            return {"final_sentiment": "neutral", "method": "fast_default"}
-
-        global sentiment_model
+
+    def __init__(self, tables: dict[str, list[str]], bounded: frozenset[str] = frozenset()):
+        owners: dict[str, set[str]] = {}
+        for category, keywords in tables.items():
+            for keyword in keywords:
+                owners.setdefault(keyword, set()).add(category)
+        self.regex = re.compile(f"(?=({self._trie_pattern(owners)}))")
+        # For each keyword: categories hit by it or any keyword prefixing it,
+        # and the bounded keywords among those prefixes, which need checking.
+        self.categories: dict[str, frozenset[str]] = {}
+        self.bounded: dict[str, tuple[tuple[str, frozenset[str]], ...]] = {}
+        for keyword in owners:
+            prefixes = [other for other in owners if keyword.startswith(other)]
+            self.categories[keyword] = frozenset(
+                category
+                for other in prefixes
+                for category in owners[other]
+                if category not in bounded
+            )
+            self.bounded[keyword] = tuple(
+                (other, frozenset(owners[other] & bounded))
+                for other in prefixes
+                if owners[other] & bounded
+            )
+
+    @staticmethod
+    def _trie_pattern(keywords) -> str:
+        trie: dict = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def build(node: dict) -> str:
+            ends = "" in node
+            branches = [
+                re.escape(char) + build(child)
+                for char, child in sorted(node.items())
+                if char
+            ]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            if ends:
+                return f"(?:{body})?"
+            return body
+
+        return build(trie)
+
+    def scan(self, text: str) -> set[str]:
+        """Categories with at least one keyword in ``text``."""
+        hits: set[str] = set()
+        for match in self.regex.finditer(text):
+            keyword = match.group(1)
+            hits |= self.categories[keyword]
+            start = match.start()
+            for other, categories in self.bounded[keyword]:
+                if categories <= hits:
+                    continue
+                end = start + len(other)
+                if (start == 0 or not _WORD_CHAR.match(text, start - 1)) and (
+                    end == len(text) or not _WORD_CHAR.match(text, end)
+                ):
+                    hits |= categories
+        return hits
+
+
+_WORD_CHAR = re.compile(r"\w")
+KEYWORD_RULES = KeywordAutomaton(
+    {
+        "negative": NEGATIVE_KEYWORDS,
+        "positive": POSITIVE_KEYWORDS,
+        "mixed": MIXED_KEYWORDS,
+        "neutral": NEUTRAL_INDICATORS,
+        "strong_negative": STRONG_NEGATIVE_KEYWORDS,
+    },
+    bounded=frozenset({"strong_negative"}),
+)
+
+
+def keyword_fingerprint() -> str:
+    """Hash of the keyword tables plus SENTIMENT_REVISION."""
+    sources = [str(SENTIMENT_REVISION)]
+    for table in (
+        NEGATIVE_KEYWORDS,
+        POSITIVE_KEYWORDS,
+        MIXED_KEYWORDS,
+        NEUTRAL_INDICATORS,
+        STRONG_NEGATIVE_KEYWORDS,
+    ):
+        sources.append("\t".join(sorted(table)))
+    return hashlib.sha256("\n".join(sources).encode("utf-8")).hexdigest()[:12]
+
+
+KEYWORD_VERSION = keyword_fingerprint()
+
+
+def sentiment_fast() -> bool:
+    return (
+        os.getenv("NEWS_SENTIMENT_FAST")
+        or os.getenv("NEWS_PIPELINE_FAST", "")
+    ).lower() in {"1", "true", "yes"}
+
+
+def _rule_decision(lower_text: str) -> dict | None:
+    """Result of the keyword rules or linear tier, or None when neither decides."""
+    hits = KEYWORD_RULES.scan(lower_text)
+    has_negative = "negative" in hits
+    has_positive = "positive" in hits
+    has_mixed = "mixed" in hits
+    has_neutral = "neutral" in hits
+    has_strong_negative = "strong_negative" in hits
+
+    if has_strong_negative:
+        return {"final_sentiment": "negative", "method": "strong_negative_rules"}
+    if has_negative and not has_positive:
+        return {"final_sentiment": "negative", "method": "negative_rules"}
+    if (has_negative and has_positive) or has_mixed:
+        return {"final_sentiment": "neutral", "method": "mixed_rules"}
+    if has_neutral and not has_negative and not has_positive:
+        return {"final_sentiment": "neutral", "method": "neutral_rules"}
+
+    # Middle tier: the hashed linear model answers when it is confident.
+    linear = linear_decision(lower_text)
+    if linear is not None:
+        return linear
+
+    if sentiment_fast():
+        if has_positive and not has_negative:
+            return {"final_sentiment": "positive", "method": "positive_rules"}
+        return {"final_sentiment": "neutral", "method": "fast_default"}
+    return None
+
+
+def _sentiment_model():
+    global sentiment_model
+    with _model_lock:
         if sentiment_model is None:
-            from transformers import pipeline
+            from onnx_backend import onnx_pipeline
+
+            model_name = os.getenv("SENTIMENT_MODEL_NAME", DEFAULT_SENTIMENT_MODEL)
+            sentiment_model = onnx_pipeline("sentiment-analysis", model_name)
+            if sentiment_model is None:
+                from transformers import pipeline
+
+                sentiment_model = pipeline(
+                    "sentiment-analysis",
+                    model=model_name,
+                    device=_transformer_device(),
+                )
+        return sentiment_model
+
+
+def _model_result(prediction: dict) -> dict:
+    label = prediction["label"].lower()
+    score = prediction.get("score")
+
+    # ✅ Model fallback
+    if "positive" in label:
+        return {"final_sentiment": "positive", "score": score, "method": "model"}
+    elif "neutral" in label:
+        return {"final_sentiment": "neutral", "score": score, "method": "model"}
+    elif "negative" in label:
+        return {"final_sentiment": "negative", "score": score, "method": "model"}
+    else:
+        return {"final_sentiment": "neutral", "score": score, "method": "model"}
+
 
-            sentiment_model = pipeline(
-                "sentiment-analysis",
-                model=os.getenv("SENTIMENT_MODEL_NAME", DEFAULT_SENTIMENT_MODEL),
-                device=_transformer_device(),
+def analyze_keywords_batch(items: list[tuple[str, str]]) -> list[dict]:
+    """
+    Classify many ``(text, context)`` pairs, returning results in order.
+
+    The keyword rules run on every item first; only the undecided ones go to
+    the transformer, in batches of ``NEWS_SENTIMENT_BATCH_SIZE`` (default 16)
+    with tokenizer truncation.
+    """
+    results: list[dict | None] = [None] * len(items)
+    undecided: list[tuple[int, str]] = []
+    for index, (text, context) in enumerate(items):
+        try:
+            full_text = f"{text}. {context}".strip()
+            results[index] = _rule_decision(full_text.lower())
+            if results[index] is None:
+                undecided.append((index, full_text))
+        except Exception as e:
+            print(f"❌ Sentiment analysis failed: {e}")
+            results[index] = {"final_sentiment": "neutral"}
+
+    if undecided:
+        try:
+            predictions = _sentiment_model()(
+                [full_text[:512] for _index, full_text in undecided],
+                batch_size=int(os.getenv("NEWS_SENTIMENT_BATCH_SIZE", "16") or 16),
+                truncation=True,
             )
+            for (index, _full_text), prediction in zip(undecided, predictions):
+                results[index] = _model_result(prediction)
+        except Exception as e:
+            print(f"❌ Sentiment analysis failed: {e}")
+            for index, _full_text in undecided:
+                results[index] = {"final_sentiment": "neutral"}
+    return results
+
+
+def sentiment_version() -> str:
+    """Identifies what ``analyze_keywords_batch`` would currently return."""
+    if sentiment_fast():
+        model = "fast"
+    else:
+        # Quantized ONNX labels can differ from PyTorch ones.
+        model = f"{os.getenv('SENTIMENT_MODEL_NAME', DEFAULT_SENTIMENT_MODEL)}@{inference_backend()}"
+    return f"{KEYWORD_VERSION}:{model}:{linear_version()}"
 
-        result = sentiment_model(full_text[:512])
-        label = result[0]["label"].lower()
-        score = result[0].get("score")
-
-        # ✅ Model fallback
-        if "positive" in label:
-            return {"final_sentiment": "positive", "score": score, "method": "model"}
-        elif "neutral" in label:
-            return {"final_sentiment": "neutral", "score": score, "method": "model"}
-        elif "negative" in label:
-            return {"final_sentiment": "negative", "score": score, "method": "model"}
-        else:
-            return {"final_sentiment": "neutral", "score": score, "method": "model"}
-        
-    except Exception as e:
-        print(f"❌ Sentiment analysis failed: {e}")
-        return {"final_sentiment": "neutral"}
+
+def analyze_keywords(text: str, context: str = "") -> dict:
+    """
+    Robust sentiment classifier using a hybrid of model + rules.
+    """
+    return analyze_keywords_batch([(text, context)])[0]
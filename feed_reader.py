@@ -0,0 +1,170 @@
+"""Incremental RSS/Atom reading.
+
+``iter_feed_items`` feeds the response body to a pull parser chunk by chunk
+and yields one item as soon as its closing tag arrives, then drops the
+element so the parsed feed never accumulates in memory. Given the newest
+publication time seen on the previous successful run it stops once the feed
+is clearly past it, so only the new head of a long feed is downloaded.
+"""
+from __future__ import annotations
+
+import datetime
+import os
+import threading
+from email.utils import parsedate_to_datetime
+
+from lxml import etree
+
+from cache_store import load_json, save_json
+
+MARKS_FILE = "feed_marks.json"
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA_IMAGE_URL = etree.XPath(
+    "string(media:content/@url | media:thumbnail/@url)",
+    namespaces={"media": "http://search.yahoo.com/mrss/"},
+)
+# Feeds are newest-first but not strictly so (updated stories get bumped);
+# a few consecutive already-seen items mean the rest is old too.
+STALE_ITEMS_BEFORE_STOP = 3
+
+
+def cutoff_enabled() -> bool:
+    return os.getenv("NEWS_RSS_CUTOFF", "1").lower() not in {"0", "false", "no"}
+
+
+def parse_published(value: str | None) -> datetime.datetime | None:
+    """RFC 822 (RSS) or ISO 8601 (Atom) timestamp, always timezone-aware."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        published = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            published = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=datetime.timezone.utc)
+    return published
+
+
+def _atom_link(entry) -> str:
+    for link in entry.iterfind(ATOM + "link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return ""
+
+
+def _item_fields(item) -> dict:
+    if item.tag == ATOM + "entry":
+        return {
+            "title": item.findtext(ATOM + "title"),
+            "link": _atom_link(item).strip(),
+            "summary": (
+                item.findtext(ATOM + "summary") or item.findtext(ATOM + "content") or ""
+            ).strip(),
+            "published": parse_published(
+                item.findtext(ATOM + "published") or item.findtext(ATOM + "updated")
+            ),
+            "image": MEDIA_IMAGE_URL(item) or None,
+        }
+    return {
+        "title": item.findtext("title"),
+        "link": (item.findtext("link") or "").strip(),
+        "summary": (item.findtext("description") or "").strip(),
+        "published": parse_published(item.findtext("pubDate")),
+        "image": MEDIA_IMAGE_URL(item) or None,
+    }
+
+
+def _release(element) -> None:
+    """Free a finished item and the already-processed siblings before it."""
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def iter_feed_items(chunks, since: datetime.datetime | None = None):
+    """Yield item dicts from an iterable of feed body chunks.
+
+    Items published at or before ``since`` are skipped; reading stops after
+    ``STALE_ITEMS_BEFORE_STOP`` of them in a row. Undated items are always
+    yielded.
+    """
+    parser = etree.XMLPullParser(
+        events=("end",), tag=("item", ATOM + "entry"), resolve_entities=False
+    )
+    stale = 0
+
+    def drain():
+        nonlocal stale
+        for _event, element in parser.read_events():
+            item = _item_fields(element)
+            _release(element)
+            if since is not None and item["published"] and item["published"] <= since:
+                stale += 1
+                continue
+            stale = 0
+            yield item
+
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from drain()
+        if stale >= STALE_ITEMS_BEFORE_STOP:
+            return
+    parser.close()
+    yield from drain()
+
+
+class FeedMarks:
+    """Newest publication time per feed, committed only after a whole run.
+
+    Marks observed during a run stay pending until ``commit()`` so a run
+    that crashes halfway does not hide items it never processed.
+    """
+
+    def __init__(self, name: str = MARKS_FILE):
+        self.name = name
+        self.marks: dict[str, str] | None = None
+        self.pending: dict[str, datetime.datetime] = {}
+        self.lock = threading.Lock()
+
+    def since(self, feed_url: str) -> datetime.datetime | None:
+        if not cutoff_enabled():
+            return None
+        with self.lock:
+            if self.marks is None:
+                self.marks = load_json(self.name, {})
+            return parse_published(self.marks.get(feed_url))
+
+    def observe(self, feed_url: str, published: datetime.datetime | None) -> None:
+        if published is None:
+            return
+        with self.lock:
+            current = self.pending.get(feed_url)
+            if current is None or published > current:
+                self.pending[feed_url] = published
+
+    def discard(self, feed_url: str) -> None:
+        """Keep the previous mark, e.g. when not every new item was handled."""
+        with self.lock:
+            self.pending.pop(feed_url, None)
+
+    def commit(self) -> None:
+        with self.lock:
+            if not self.pending:
+                return
+            if self.marks is None:
+                self.marks = load_json(self.name, {})
+            for feed_url, published in self.pending.items():
+                previous = parse_published(self.marks.get(feed_url))
+                if previous is None or published > previous:
+                    self.marks[feed_url] = published.isoformat()
+            self.pending.clear()
+            save_json(self.name, self.marks)
+
+
+feed_marks = FeedMarks()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# One request per second per publisher matches the old global time.sleep(1).
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 1
+
+
+def host_key(url: str) -> str:
+    host = (urlparse(url or "").hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        self.rate = float(rate)
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, booking a future one if none is left.
+
+        Returns the seconds until the reserved token is due. Tokens may go
+        negative, so successive reservations queue up at ``1 / rate`` intervals.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self) -> None:
+        time.sleep(self.reserve())
+
+
+class FetchScheduler:
+    """Keep several article fetches in flight while staying polite per host.
+
+    ``fetch`` is called on a worker thread once the URL's host bucket grants a
+    token. A URL whose token is not due yet waits in a timer heap rather than
+    on a worker, so a slow host never holds workers other hosts could use.
+    Limits come from each site's ``rate_limit`` entry in ``news_sites.json``;
+    unknown hosts fall back to one request per second. An optional ``cached``
+    callable answers from local storage without spending a token; it returns
+    None on a miss.
+    """
+
+    def __init__(self, fetch, max_in_flight: int | None = None, cached=None):
+        self.fetch = fetch
+        self.cached = cached
+        self.max_in_flight = max(
+            1,
+            max_in_flight
+            or int(os.getenv("NEWS_FETCH_CONCURRENCY", "4") or 4),
+        )
+        self.pool = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="article-fetch"
+        )
+        self.limits: dict[str, tuple[float, int]] = {}
+        self.buckets: dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+        # (due time, sequence, url, future) for URLs waiting on their bucket.
+        self.delayed: list[tuple[float, int, str, Future]] = []
+        self.sequence = itertools.count()
+        self.wakeup = threading.Condition()
+        self.dispatcher: threading.Thread | None = None
+        self.closed = False
+
+    def configure(self, domain: str, rate: float, burst: int = DEFAULT_BURST) -> None:
+        with self.lock:
+            self.limits[host_key(f"//{domain}")] = (float(rate), int(burst))
+
+    def configure_sites(self, sites: dict) -> None:
+        """Apply each registered site's ``rate_limit`` to its hosts."""
+        for cfg in sites.values():
+            for url in (cfg.base_url, cfg.rss_url):
+                if url:
+                    self.configure(
+                        host_key(url), cfg.rate_limit.per_second, cfg.rate_limit.burst
+                    )
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = host_key(url)
+        with self.lock:
+            # Article links often live on a subdomain of the configured site
+            # (edition.cnn.com, rss.nytimes.com), so share the parent's bucket.
+            domain = next(
+                (
+                    d
+                    for d in sorted(self.limits, key=len, reverse=True)
+                    if host == d or host.endswith("." + d)
+                ),
+                host,
+            )
+            if domain not in self.buckets:
+                rate, burst = self.limits.get(domain, (DEFAULT_RATE, DEFAULT_BURST))
+                self.buckets[domain] = TokenBucket(rate, burst)
+            return self.buckets[domain]
+
+    def _start(self, url: str, future: Future) -> None:
+        """Answer from the cache, fetch now, or park ``url`` until its token is due."""
+        if future.cancelled():
+            return
+        if self.cached is not None:
+            try:
+                hit = self.cached(url)
+            except Exception as e:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+                return
+            if hit is not None:
+                if future.set_running_or_notify_cancel():
+                    future.set_result(hit)
+                return
+        delay = self.bucket_for(url).reserve()
+        if delay <= 0:
+            self._fetch(url, future)
+            return
+        with self.wakeup:
+            if self.closed:
+                future.cancel()
+                return
+            heapq.heappush(
+                self.delayed, (time.monotonic() + delay, next(self.sequence), url, future)
+            )
+            if self.dispatcher is None:
+                self.dispatcher = threading.Thread(
+                    target=self._dispatch, name="article-fetch-timer", daemon=True
+                )
+                self.dispatcher.start()
+            self.wakeup.notify()
+
+    def _fetch(self, url: str, future: Future) -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.fetch(url))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _dispatch(self) -> None:
+        """Hand parked URLs to the pool as their tokens come due."""
+        with self.wakeup:
+            while not self.closed:
+                if not self.delayed:
+                    self.wakeup.wait()
+                    continue
+                due, _sequence, url, future = self.delayed[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self.wakeup.wait(wait)
+                    continue
+                heapq.heappop(self.delayed)
+                if not future.cancelled():
+                    self.pool.submit(self._fetch, url, future)
+
+    def submit(self, url: str) -> Future:
+        future: Future = Future()
+        started = self.pool.submit(self._start, url, future)
+        # A shutdown that drops the queued start must not leave ``future`` pending.
+        started.add_done_callback(lambda task: task.cancelled() and future.cancel())
+        return future
+
+    def iter_results(self, urls, window: int | None = None):
+        """Yield ``fetch(url)`` results in input order with a prefetch window.
+
+        Up to ``window`` fetches run ahead of the consumer, so the analysis
+        loop works on one article while the next ones download. Closing the
+        generator early cancels fetches that have not started yet.
+        """
+        window = max(1, window or self.max_in_flight)
+        pending: deque[Future] = deque()
+        urls = iter(urls)
+        try:
+            for url in urls:
+                pending.append(self.submit(url))
+                if len(pending) >= window:
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for url in urls:
+                    pending.append(self.submit(url))
+                    break
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self) -> None:
+        with self.wakeup:
+            self.closed = True
+            for _due, _sequence, _url, future in self.delayed:
+                future.cancel()
+            self.delayed.clear()
+            self.wakeup.notify()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        if self.dispatcher is not None:
+            self.dispatcher.join()
@@ -0,0 +1,248 @@
+"""Compressed, content-addressed store of fetched article HTML.
+
+Pages are keyed by URL plus the UTC date they were fetched, so the scrape,
+the bias backfill and offline parser experiments all reuse one download.
+The store is bounded by size and evicts least recently used pages.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import zlib
+
+from cache_store import CACHE_DIR, cache_path
+from url_index import normalize_url
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+STORE_DIR = "html"
+CODEC = "zst" if zstandard else "gz"
+
+
+def store_enabled() -> bool:
+    return os.getenv("NEWS_HTML_CACHE", "1").lower() not in {"0", "false", "no"}
+
+
+def max_store_bytes() -> int:
+    return int(float(os.getenv("NEWS_HTML_CACHE_MAX_MB", "256") or 256) * 1024 * 1024)
+
+
+def max_age_days() -> int:
+    """How many fetch dates (today included) a cached page may come from."""
+    return max(1, int(os.getenv("NEWS_HTML_CACHE_DAYS", "1") or 1))
+
+
+def page_key(url: str, day: str) -> str:
+    return hashlib.sha256(f"{day}\n{normalize_url(url)}".encode("utf-8")).hexdigest()
+
+
+def _compressor():
+    """Incremental compressor with ``compress(chunk)`` and ``flush()``."""
+    if zstandard:
+        return zstandard.ZstdCompressor(level=10).compressobj()
+    # wbits=31 writes a gzip member, readable by gzip.decompress.
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "zst":
+        if not zstandard:
+            raise ValueError("page was stored with zstd but zstandard is not installed")
+        # Streamed frames carry no content size, which decompress() requires.
+        return zstandard.ZstdDecompressor().decompressobj().decompress(payload)
+    return gzip.decompress(payload)
+
+
+class PageWriter:
+    """Compresses one fetched page to disk as its chunks arrive.
+
+    Used as a context manager: a clean exit publishes the page, an exception
+    (a rejected or failed download) discards it. Inert when the store is off.
+    """
+
+    def __init__(self, store: "HtmlStore", url: str, enabled: bool = True):
+        self.store = store
+        self.url = url
+        self.enabled = enabled
+        self.compressor = None
+        self.file = None
+        self.tmp_path = None
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        if not self.enabled or not chunk:
+            return
+        if self.file is None:
+            self.compressor = _compressor()
+            self.day = datetime.datetime.now(datetime.timezone.utc).date().isoformat()
+            self.page_path, self.meta_path = self.store._paths(page_key(self.url, self.day))
+            self.tmp_path = f"{self.page_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            self.file = open(self.tmp_path, "wb")
+        self.file.write(self.compressor.compress(chunk))
+        self.size += len(chunk)
+
+    def commit(self) -> None:
+        if self.file is None:
+            return
+        self.file.write(self.compressor.flush())
+        self.file.close()
+        self.file = None
+        stored = os.path.getsize(self.tmp_path)
+        os.replace(self.tmp_path, self.page_path)
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"url": self.url, "fetched": self.day, "codec": CODEC, "size": self.size}, f
+            )
+        self.store._account(stored)
+
+    def abort(self) -> None:
+        if self.file is None:
+            return
+        self.file.close()
+        self.file = None
+        with contextlib.suppress(OSError):
+            os.remove(self.tmp_path)
+
+    def __enter__(self) -> "PageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class HtmlStore:
+    def __init__(self, name: str = STORE_DIR):
+        self.name = name
+        self.total_bytes: int | None = None
+        self.lock = threading.Lock()
+
+    def _paths(self, key: str) -> tuple[str, str]:
+        base = cache_path(self.name, key[:2], key)
+        return base + ".page", base + ".json"
+
+    def get(self, url: str) -> bytes | None:
+        if not store_enabled():
+            return None
+        today = datetime.datetime.now(datetime.timezone.utc).date()
+        for offset in range(max_age_days()):
+            day = (today - datetime.timedelta(days=offset)).isoformat()
+            page_path, meta_path = self._paths(page_key(url, day))
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(page_path, "rb") as f:
+                    content = _decompress(f.read(), meta.get("codec", "gz"))
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                print(f"⚠️ Dropping unreadable cached page for {url}: {e}")
+                continue
+            # Touch the payload so eviction sees it as recently used. Another
+            # thread's eviction may have removed it since the read.
+            with contextlib.suppress(OSError):
+                os.utime(page_path)
+            return content
+        return None
+
+    def writer(self, url: str) -> PageWriter:
+        """A ``PageWriter`` that stores ``url`` from its response chunks."""
+        return PageWriter(self, url, store_enabled())
+
+    def put(self, url: str, content: bytes) -> None:
+        with self.writer(url) as page:
+            page.write(content)
+
+    def _account(self, stored: int) -> None:
+        with self.lock:
+            if self.total_bytes is None:
+                self.total_bytes = sum(size for _path, size, _mtime in self._entries())
+            else:
+                self.total_bytes += stored
+            if self.total_bytes > max_store_bytes():
+                self._evict(max_store_bytes())
+
+    def _entries(self):
+        root = os.path.join(CACHE_DIR, self.name)
+        for directory, _subdirs, files in os.walk(root):
+            for filename in files:
+                if filename.endswith(".page"):
+                    path = os.path.join(directory, filename)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def _evict(self, limit: int) -> None:
+        # Drop to 90% of the limit so a busy run does not evict on every put.
+        target = int(limit * 0.9)
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _path, size, _mtime in entries)
+        for path, size, _mtime in entries:
+            if total <= target:
+                break
+            for stale in (path, path[: -len(".page")] + ".json"):
+                try:
+                    os.remove(stale)
+                except FileNotFoundError:
+                    pass
+            total -= size
+        self.total_bytes = total
+
+    def iter_pages(self):
+        """Yield ``(url, fetched_date, html_bytes)`` for every cached page."""
+        for page_path, _size, _mtime in self._entries():
+            meta_path = page_path[: -len(".page")] + ".json"
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                with open(page_path, "rb") as f:
+                    content = _decompress(f.read(), meta.get("codec", "gz"))
+            except Exception:
+                continue
+            yield meta["url"], meta.get("fetched"), content
+
+
+html_store = HtmlStore()
+
+
+def reparse(limit: int = 0) -> None:
+    """Run the current article parser over cached pages without any network."""
+    from sentiment_analysis_pipeline import parse_article_html
+
+    parsed = 0
+    empty = 0
+    started = time.perf_counter()
+    for url, fetched, content in html_store.iter_pages():
+        text, image = parse_article_html(content)
+        parsed += 1
+        if text == "Content not available":
+            empty += 1
+        print(f"{fetched} {len(text.split()):5d} words image={bool(image)} {url}")
+        if limit and parsed >= limit:
+            break
+    elapsed = time.perf_counter() - started
+    print(
+        f"Parsed {parsed} cached pages ({empty} without content) in {elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-run parse_article_html over the cached article pages."
+    )
+    parser.add_argument("--limit", type=int, default=0, help="Maximum pages; 0 is all")
+    reparse(parser.parse_args().limit)
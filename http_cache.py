@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+
+from cache_store import load_json, save_json
+from http_sessions import get_session
+
+CACHE_FILE = "http_validators.json"
+
+
+def cache_enabled() -> bool:
+    return os.getenv("NEWS_HTTP_CACHE", "1").lower() not in {"0", "false", "no"}
+
+
+def cache_key(url: str, *parser_args: str) -> str:
+    """Key a listing by URL plus the selectors used to parse it."""
+    raw = "\n".join((url, *parser_args))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class ValidatorCache:
+    """ETag/Last-Modified validators and the article list parsed from each body.
+
+    Like ``FeedMarks``, new validators stay pending until ``commit()``: a 304
+    next run skips the whole site, so a listing is only remembered once every
+    item on it was handled. ``discard`` drops a site whose run fell short.
+    """
+
+    def __init__(self, name: str = CACHE_FILE):
+        self.name = name
+        self.entries: dict[str, dict] | None = None
+        self.pending: dict[str, dict] = {}
+        self.unchanged: set[str] = set()
+        self.lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        if self.entries is None:
+            self.entries = load_json(self.name, {}) if cache_enabled() else {}
+        return self.entries
+
+    def request_headers(self, key: str) -> dict:
+        with self.lock:
+            entry = self._load().get(key) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_results(self, key: str) -> list[dict] | None:
+        with self.lock:
+            entry = self._load().get(key)
+        return None if entry is None else entry.get("results", [])
+
+    def store(self, key: str, url: str, response, results: list[dict]) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not cache_enabled() or not (etag or last_modified):
+            return
+        with self.lock:
+            self.pending[key] = {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "results": results,
+            }
+
+    def discard(self, url: str) -> None:
+        """Forget this run's validators for ``url``, e.g. after a truncated run."""
+        with self.lock:
+            for key in [key for key, entry in self.pending.items() if entry["url"] == url]:
+                del self.pending[key]
+
+    def commit(self) -> None:
+        with self.lock:
+            if not self.pending:
+                return
+            self._load().update(self.pending)
+            self.pending.clear()
+            save_json(self.name, self.entries)
+
+    def mark_unchanged(self, url: str) -> None:
+        with self.lock:
+            self.unchanged.add(url)
+
+    def is_unchanged(self, url: str) -> bool:
+        """True when ``url`` answered 304 Not Modified during this run."""
+        with self.lock:
+            return url in self.unchanged
+
+
+validator_cache = ValidatorCache()
+
+
+def conditional_get(
+    url: str, key: str, headers: dict, timeout: int = 30, stream: bool = False
+):
+    """GET ``url`` with stored validators.
+
+    Returns ``(response, cached_results)``. ``cached_results`` is the
+    previously parsed article list when the server answered 304, else None.
+    """
+    request_headers = dict(headers)
+    if cache_enabled():
+        request_headers.update(validator_cache.request_headers(key))
+    response = get_session(url).get(
+        url, headers=request_headers, timeout=timeout, stream=stream
+    )
+    if response.status_code == 304:
+        cached = validator_cache.cached_results(key)
+        if cached is not None:
+            validator_cache.mark_unchanged(url)
+            return response, cached
+        # Validators without a parsed body are useless; fetch it in full.
+        response.close()
+        response = get_session(url).get(
+            url, headers=headers, timeout=timeout, stream=stream
+        )
+    return response, None
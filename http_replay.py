@@ -0,0 +1,128 @@
+"""Record and replay HTTP traffic for offline pipeline runs.
+
+``NEWS_HTTP_REPLAY=record`` saves every response that passes through a
+session from ``http_sessions`` (listings, feeds, article pages, Gemini) to
+``NEWS_HTTP_FIXTURES``. ``NEWS_HTTP_REPLAY=replay`` serves those responses
+from disk and never opens a socket; ``NEWS_HTTP_REPLAY_LATENCY`` adds a delay
+per response, either a number of milliseconds or ``recorded`` for the time
+the live request took.
+
+Fixtures are keyed by method, URL and request body. Request headers are not
+part of the key and are never written, so API keys and cache validators stay
+out of the archive.
+"""
+from __future__ import annotations
+
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPResponse
+
+FIXTURES_DIR = "http_fixtures"
+# Headers describing the wire encoding; fixtures store decoded bodies.
+WIRE_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+def replay_mode() -> str:
+    mode = os.getenv("NEWS_HTTP_REPLAY", "").strip().lower()
+    return mode if mode in {"record", "replay"} else ""
+
+
+def fixtures_dir() -> str:
+    return os.getenv("NEWS_HTTP_FIXTURES", FIXTURES_DIR)
+
+
+def fixture_key(method: str, url: str, body: bytes | str | None = None) -> str:
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    digest = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+    digest.update(body or b"")
+    return digest.hexdigest()[:32]
+
+
+def fixture_path(key: str) -> str:
+    return os.path.join(fixtures_dir(), key[:2], f"{key}.json.gz")
+
+
+def save_fixture(response: requests.Response) -> None:
+    request = response.request
+    key = fixture_key(request.method, request.url, request.body)
+    entry = {
+        "method": request.method,
+        "url": request.url,
+        "status": response.status_code,
+        "reason": response.reason,
+        "headers": {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in WIRE_HEADERS
+        },
+        "elapsed": response.elapsed.total_seconds(),
+        "body": base64.b64encode(response.content).decode("ascii"),
+    }
+    path = fixture_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+
+def load_fixture(method: str, url: str, body=None) -> dict | None:
+    try:
+        with gzip.open(fixture_path(fixture_key(method, url, body)), "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _record_response(response: requests.Response, *args, **kwargs):
+    # Reading .content here turns streamed responses into buffered ones;
+    # iter_content still works on the buffered body afterwards.
+    save_fixture(response)
+    return response
+
+
+class ReplayAdapter(HTTPAdapter):
+    """Transport adapter answering every request from the fixture archive."""
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = load_fixture(request.method, request.url, request.body)
+        if entry is None:
+            raise requests.ConnectionError(
+                f"No recorded response for {request.method} {request.url}",
+                request=request,
+            )
+        latency = os.getenv("NEWS_HTTP_REPLAY_LATENCY", "").strip().lower()
+        if latency == "recorded":
+            time.sleep(entry.get("elapsed", 0))
+        elif latency:
+            time.sleep(float(latency) / 1000)
+        raw = HTTPResponse(
+            body=io.BytesIO(base64.b64decode(entry["body"])),
+            headers=entry["headers"],
+            status=entry["status"],
+            reason=entry.get("reason"),
+            preload_content=False,
+            decode_content=False,
+        )
+        return self.build_response(request, raw)
+
+
+def prepare_session(session: requests.Session) -> requests.Session:
+    """Attach recording or replay to a new session, per NEWS_HTTP_REPLAY."""
+    mode = replay_mode()
+    if mode == "replay":
+        adapter = ReplayAdapter()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    elif mode == "record":
+        session.hooks["response"].append(_record_response)
+    return session
@@ -1,4 +1,6 @@
+import hashlib
 import re
+import threading
 from typing import List, Set
 
 try:
@@ -8,6 +10,7 @@ except Exception:
 
 nlp_trf = None
 nlp_xx = None
+_model_lock = threading.Lock()
 
 # —————————————————————————————————————————————————————————————————————————————
 # 2) Stopwords & month names we never want to highlight:
@@ -109,6 +112,56 @@ def is_acronym(text: str) -> bool:
 
 # —————————————————————————————————————————————————————————————————————————————
 # 4) Main entity extractor:
+# Bump when extraction or filtering changes in code; part of entities_version().
+ENTITY_REVISION = 2
+
+
+def entity_rules_fingerprint() -> str:
+    """Hash of the entity filter tables plus ENTITY_REVISION."""
+    sources = [
+        str(ENTITY_REVISION),
+        "\t".join(sorted(STOPWORDS)),
+        "\t".join(sorted(ALLOWED_LABELS)),
+        TRAILING_PUNCTUATION,
+        *(pattern.pattern for pattern in BOILERPLATE_ENTITY_PATTERNS),
+    ]
+    return hashlib.sha256("\n".join(sources).encode("utf-8")).hexdigest()[:12]
+
+
+ENTITY_RULES_VERSION = entity_rules_fingerprint()
+
+
+def _entity_models():
+    """Load the spaCy models once; a model that fails to load is ``False``."""
+    global nlp_trf, nlp_xx
+    with _model_lock:
+        if nlp_trf is None:
+            try:
+                import spacy
+
+                spacy.prefer_gpu()
+                nlp_trf = spacy.load("en_core_web_trf", disable=["parser", "lemmatizer"])
+            except Exception:
+                nlp_trf = False
+
+        if nlp_xx is None:
+            try:
+                import spacy
+
+                nlp_xx = spacy.load("xx_ent_wiki_sm", disable=["parser", "lemmatizer"])
+            except Exception:
+                nlp_xx = False
+
+    return nlp_trf, nlp_xx
+
+
+def entities_version() -> str:
+    """Identifies which models ``extract_entities`` would currently use."""
+    nlp_trf, nlp_xx = _entity_models()
+    backends = [name for name, model in (("trf", nlp_trf), ("xx", nlp_xx)) if model] or ["regex"]
+    return f"{ENTITY_RULES_VERSION}:{'+'.join(backends)}"
+
+
 def extract_entities(text: str) -> List[str]:
     """
     Extract & return a de-duplicated list of true lookup-worthy
@@ -116,24 +169,7 @@ def extract_entities(text: str) -> List[str]:
     """
     combined: List[str] = []
     seen: Set[str] = set()
-
-    global nlp_trf, nlp_xx
-    if nlp_trf is None:
-        try:
-            import spacy
-
-            spacy.prefer_gpu()
-            nlp_trf = spacy.load("en_core_web_trf", disable=["parser", "lemmatizer"])
-        except Exception:
-            nlp_trf = False
-
-    if nlp_xx is None:
-        try:
-            import spacy
-
-            nlp_xx = spacy.load("xx_ent_wiki_sm", disable=["parser", "lemmatizer"])
-        except Exception:
-            nlp_xx = False
+    nlp_trf, nlp_xx = _entity_models()
 
     if not nlp_trf and not nlp_xx:
         fallback_matches = re.findall(
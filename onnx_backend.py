@@ -0,0 +1,139 @@
+"""Optional ONNX Runtime backend for the sentiment and summarization models.
+
+With ``NEWS_INFERENCE_BACKEND=onnx`` the transformer pipelines in
+``feed_data`` and ``generate_summary`` run on int8-quantized ONNX exports
+instead of PyTorch. Each model is exported and dynamically quantized once
+with ``optimum``, cached under ``NEWS_ONNX_DIR`` (default
+``.news_cache/onnx``), and then loaded on the CPU execution provider with
+``NEWS_ONNX_THREADS`` intra-op threads. Requires ``optimum[onnxruntime]``
+from requirements-ml.txt.
+"""
+from __future__ import annotations
+
+import os
+import platform
+import shutil
+import threading
+
+from cache_store import CACHE_DIR
+
+SEQ2SEQ_FILES = ("encoder_model.onnx", "decoder_model.onnx", "decoder_with_past_model.onnx")
+
+_export_lock = threading.Lock()
+
+
+def inference_backend() -> str:
+    return os.getenv("NEWS_INFERENCE_BACKEND", "torch").strip().lower() or "torch"
+
+
+def onnx_threads() -> int:
+    return max(1, int(os.getenv("NEWS_ONNX_THREADS", "0") or 0) or os.cpu_count() or 1)
+
+
+def model_dir(model_name: str) -> str:
+    root = os.getenv("NEWS_ONNX_DIR") or os.path.join(CACHE_DIR, "onnx")
+    return os.path.join(root, model_name.replace("/", "--"))
+
+
+def _quantization_config():
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    if platform.machine().lower() in {"arm64", "aarch64"}:
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+
+def _session_options():
+    import onnxruntime
+
+    options = onnxruntime.SessionOptions()
+    options.intra_op_num_threads = onnx_threads()
+    options.inter_op_num_threads = 1
+    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return options
+
+
+def _export(model_name: str, model_class, files: tuple[str, ...]) -> str:
+    """Export ``model_name`` to ONNX and quantize it, unless already cached."""
+    from optimum.onnxruntime import ORTQuantizer
+    from transformers import AutoTokenizer
+
+    base = model_dir(model_name)
+    fp32_dir = os.path.join(base, "fp32")
+    int8_dir = os.path.join(base, "int8")
+    with _export_lock:
+        if all(
+            os.path.exists(os.path.join(int8_dir, file.replace(".onnx", "_quantized.onnx")))
+            for file in files
+        ):
+            return int8_dir
+        print(f"📦 Exporting {model_name} to ONNX (int8) in {int8_dir}")
+        model = model_class.from_pretrained(model_name, export=True)
+        model.save_pretrained(fp32_dir)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        config = _quantization_config()
+        for file in files:
+            ORTQuantizer.from_pretrained(fp32_dir, file_name=file).quantize(
+                save_dir=int8_dir, quantization_config=config
+            )
+        # Quantization writes only the graphs; the pipeline needs these too.
+        model.config.save_pretrained(int8_dir)
+        if getattr(model, "generation_config", None) is not None:
+            model.generation_config.save_pretrained(int8_dir)
+        tokenizer.save_pretrained(int8_dir)
+        # Only the int8 graphs are loaded; keep the restored cache small.
+        shutil.rmtree(fp32_dir, ignore_errors=True)
+    return int8_dir
+
+
+def sentiment_pipeline(model_name: str):
+    """``transformers`` sentiment pipeline backed by a quantized ONNX model."""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+
+    path = _export(model_name, ORTModelForSequenceClassification, ("model.onnx",))
+    model = ORTModelForSequenceClassification.from_pretrained(
+        path,
+        file_name="model_quantized.onnx",
+        provider="CPUExecutionProvider",
+        session_options=_session_options(),
+    )
+    return pipeline("sentiment-analysis", model=model, tokenizer=AutoTokenizer.from_pretrained(path))
+
+
+def summarization_pipeline(model_name: str):
+    """``transformers`` summarization pipeline backed by quantized ONNX graphs."""
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+
+    path = _export(model_name, ORTModelForSeq2SeqLM, SEQ2SEQ_FILES)
+    model = ORTModelForSeq2SeqLM.from_pretrained(
+        path,
+        encoder_file_name="encoder_model_quantized.onnx",
+        decoder_file_name="decoder_model_quantized.onnx",
+        decoder_with_past_file_name="decoder_with_past_model_quantized.onnx",
+        provider="CPUExecutionProvider",
+        session_options=_session_options(),
+    )
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(path))
+
+
+PIPELINES = {
+    "sentiment-analysis": sentiment_pipeline,
+    "summarization": summarization_pipeline,
+}
+
+
+def onnx_pipeline(task: str, model_name: str):
+    """ONNX pipeline for ``task`` when the backend is selected, else ``None``.
+
+    Missing ``optimum``/``onnxruntime`` or a failed export falls back to
+    PyTorch with a warning rather than failing the run.
+    """
+    if inference_backend() != "onnx":
+        return None
+    try:
+        return PIPELINES[task](model_name)
+    except Exception as e:
+        print(f"⚠️ ONNX backend unavailable for {model_name}, using PyTorch: {e}")
+        return None
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 import re
 import json
 import os
 import time
 from collections.abc import Iterable
 
-import requests
+from http_sessions import get_session
 
 
 # These phrases describe ideological framing, not merely political subjects. Broad
@@ -160,6 +161,10 @@ BIAS_THRESHOLD = 0.12
 MIN_DIRECTIONAL_EVIDENCE = 1.5
 MAX_OCCURRENCES_PER_PHRASE = 3
 DEFAULT_GEMINI_BIAS_MODEL = "gemini-3.1-flash-lite"
+GEMINI_API_URL = "https://generativelanguage.googleapis.com"
+# Bump when scoring or the prompt changes in code; part of the analyzer versions.
+RULE_BIAS_REVISION = 1
+GEMINI_PROMPT_REVISION = 1
 
 GEMINI_RESPONSE_SCHEMA = {
     "type": "object",
@@ -458,9 +463,8 @@ Return the requested structured assessment now."""
 
     response = None
     for attempt in range(3):
-        response = requests.post(
-            "https://generativelanguage.googleapis.com/v1beta/models/"
-            f"{model}:generateContent",
+        response = get_session(GEMINI_API_URL).post(
+            f"{GEMINI_API_URL}/v1beta/models/{model}:generateContent",
             headers={
                 "x-goog-api-key": api_key,
                 "Content-Type": "application/json",
@@ -504,16 +508,53 @@ Return the requested structured assessment now."""
     return _normalize_gemini_result(json.loads(response_text), model)
 
 
-def analyze_political_bias(
-    article_text: str, headline: str = "", allow_remote: bool = True
-) -> dict:
-    """Use Gemini for whole-article analysis, with deterministic local fallback."""
+def bias_rules_fingerprint() -> str:
+    """Hash of the framing, target and tone tables plus RULE_BIAS_REVISION."""
+    source = json.dumps(
+        [
+            RULE_BIAS_REVISION,
+            LEFT_FRAMING,
+            RIGHT_FRAMING,
+            RIGHT_ALIGNED_TARGETS,
+            LEFT_ALIGNED_TARGETS,
+            POSITIVE_LANGUAGE,
+            NEGATIVE_LANGUAGE,
+            BIAS_THRESHOLD,
+            MIN_DIRECTIONAL_EVIDENCE,
+            MAX_OCCURRENCES_PER_PHRASE,
+        ],
+        sort_keys=True,
+    )
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+BIAS_RULES_VERSION = bias_rules_fingerprint()
+
+
+def gemini_bias_enabled() -> bool:
     use_fast_fallback = os.getenv("NEWS_BIAS_FAST", "").lower() in {
         "1",
         "true",
         "yes",
     }
-    if allow_remote and os.getenv("GEMINI_API_KEY") and not use_fast_fallback:
+    return bool(os.getenv("GEMINI_API_KEY")) and not use_fast_fallback
+
+
+def gemini_bias_version() -> str:
+    model = os.getenv("GEMINI_BIAS_MODEL", DEFAULT_GEMINI_BIAS_MODEL).strip()
+    schema = json.dumps(GEMINI_RESPONSE_SCHEMA, sort_keys=True).encode("utf-8")
+    return f"{GEMINI_PROMPT_REVISION}:{model}:{hashlib.sha256(schema).hexdigest()[:8]}"
+
+
+def rule_bias_version() -> str:
+    return BIAS_RULES_VERSION
+
+
+def analyze_political_bias(
+    article_text: str, headline: str = "", allow_remote: bool = True
+) -> dict:
+    """Use Gemini for whole-article analysis, with deterministic local fallback."""
+    if allow_remote and gemini_bias_enabled():
         try:
             return analyze_political_bias_with_gemini(article_text, headline)
         except Exception as error:
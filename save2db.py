@@ -4,7 +4,7 @@ import os
 import datetime
 from dotenv import load_dotenv
 from article_quality import clean_article_text, clean_headline, is_junk_article
-from political_bias import analyze_political_bias
+from political_bias import analyze_political_bias, rule_bias_version
 
 # load .env (MONGO_URL, DB_NAME, COLLECTION_NAME)
 load_dotenv()
@@ -31,6 +31,8 @@ def save_articles_to_db(json_file="sentiment_results.json"):
                 url = art.get("url")
                 if is_junk_article(headline, url, summary):
                     continue
+                # Versions the pipeline scored with; cleanup re-scores mismatches.
+                versions = dict(art.get("analyzer_versions") or {})
                 if "bias" in art and "bias_score" in art:
                     bias_result = {
                         "bias": art.get("bias"),
@@ -46,6 +48,8 @@ def save_articles_to_db(json_file="sentiment_results.json"):
                         summary, headline, allow_remote=False
                     )
                     bias_result["bias_method"] = "summary_framing_v2"
+                    if versions:
+                        versions["bias"] = rule_bias_version()
                 # pull whatever came out of your pipeline
                 doc = {
                     "headline":  headline,
@@ -63,6 +67,8 @@ def save_articles_to_db(json_file="sentiment_results.json"):
                     # now include entities
                     "entities":  art.get("entities", []),
                 }
+                if versions:
+                    doc["analyzer_versions"] = versions
                 docs.append(doc)
 
         if not docs:
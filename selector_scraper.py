@@ -1,8 +1,7 @@
-import json
-import requests
-from email.utils import parsedate_to_datetime
-from lxml import etree, html
-from selenium import webdriver
+import datetime
+import os
+import threading
+from lxml import html
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -10,10 +9,18 @@ from fake_useragent import UserAgent
 from urllib.parse import urljoin
 
 from article_quality import clean_headline, is_junk_article
+from browser_pool import driver_pool
+from cache_store import load_json, save_json
+from feed_reader import feed_marks, iter_feed_items
+from http_cache import cache_key, conditional_get, validator_cache
+from http_replay import replay_mode
+from site_registry import compiled_xpath, load_sites
 
 # Load news site configurations from JSON
-with open("news_sites.json", "r", encoding="utf-8") as file:
-    WEBSITE_CONFIG = json.load(file)
+WEBSITE_CONFIG = load_sites()
+
+RENDERED_HEADLINE_TEXT = compiled_xpath(".//h3/text() | .//span/text()")
+FEED_CHUNK_SIZE = 16 * 1024
 
 # Headers for static requests
 HEADERS = {
@@ -44,72 +51,99 @@ def filter_results(results):
     return filtered_results
 
 
-# ✅ Function to scrape static websites
-def scrape_static_website(base_url, headline_xpath, link_xpath):
-    try:
-        response = requests.get(base_url, headers=HEADERS)
-        response.raise_for_status()
-        tree = html.fromstring(response.content)
+def extract_static_entries(tree, base_url, headline_xpath, link_xpath):
+    results = []
+    link_path = compiled_xpath(link_xpath)
+    for headline in compiled_xpath(headline_xpath)(tree):
+        link = link_path(headline)
+        text = headline.text_content().strip()
 
-        headlines = tree.xpath(headline_xpath)
-        results = []
+        if link:
+            full_link = link[0]
+            if not full_link.startswith("http"):
+                full_link = urljoin(base_url, full_link)
+            results.append({"headline": text, "link": full_link})
+    return results
 
-        for headline in headlines:
-            link = headline.xpath(link_xpath)
-            text = headline.text_content().strip()
 
-            if link:
-                full_link = link[0]
-                if not full_link.startswith("http"):
-                    full_link = urljoin(base_url, full_link)
-                results.append({"headline": text, "link": full_link})
+def extract_rendered_entries(tree, base_url, headline_xpath, link_xpath):
+    """Headline cards as laid out by JavaScript-rendered listing pages."""
+    results = []
+    link_path = compiled_xpath(link_xpath)
+    for article in compiled_xpath(headline_xpath)(tree):
+        headline = RENDERED_HEADLINE_TEXT(article)
+        link = link_path(article)
+        if headline and link:
+            text = headline[0].strip()
+            full_link = link[0].strip()
+            if not full_link.startswith("http"):
+                full_link = urljoin(base_url, full_link)
+            results.append({"headline": text, "link": full_link})
+    return results
+
+
+def _static_listing(base_url, headline_xpath, link_xpath, extract, *key_extra):
+    key = cache_key(base_url, headline_xpath, link_xpath, *key_extra)
+    response, cached = conditional_get(base_url, key, HEADERS)
+    if cached is not None:
+        return cached
+    response.raise_for_status()
+    tree = html.fromstring(response.content)
+    results = filter_results(extract(tree, base_url, headline_xpath, link_xpath))
+    validator_cache.store(key, base_url, response, results)
+    return results
 
-        return filter_results(results)
 
+# ✅ Function to scrape static websites
+def scrape_static_website(base_url, headline_xpath, link_xpath):
+    try:
+        return _static_listing(
+            base_url, headline_xpath, link_xpath, extract_static_entries
+        )
     except Exception as e:
         print(f"❌ Error scraping static website: {e}")
         return []
 
 
 def scrape_rss_feed(feed_url):
-    """Read article metadata from a publisher's official RSS feed."""
+    """Read article metadata from a publisher's official RSS or Atom feed.
+
+    Items are parsed as the body streams in and reading stops once the feed
+    reaches items the last successful run already saw.
+    """
     try:
-        response = requests.get(feed_url, headers=HEADERS, timeout=30)
-        response.raise_for_status()
-        root = etree.fromstring(response.content)
-        namespaces = {"media": "http://search.yahoo.com/mrss/"}
+        key = cache_key(feed_url)
+        response, cached = conditional_get(feed_url, key, HEADERS, stream=True)
+        if cached is not None:
+            return cached
         results = []
+        try:
+            response.raise_for_status()
+            chunks = response.iter_content(chunk_size=FEED_CHUNK_SIZE)
+            for item in iter_feed_items(chunks, feed_marks.since(feed_url)):
+                feed_marks.observe(feed_url, item["published"])
+                headline = clean_headline(item["title"])
+                link = item["link"]
+                if not headline or not link or is_junk_article(
+                    headline, link, item["summary"]
+                ):
+                    continue
 
-        for item in root.xpath("//item"):
-            headline = clean_headline(item.findtext("title"))
-            link = (item.findtext("link") or "").strip()
-            summary = (item.findtext("description") or "").strip()
-            published = (item.findtext("pubDate") or "").strip()
-            image = item.xpath(
-                "string(media:content/@url | media:thumbnail/@url)",
-                namespaces=namespaces,
-            )
-            if not headline or not link or is_junk_article(headline, link, summary):
-                continue
-
-            timestamp = None
-            if published:
-                try:
-                    timestamp = parsedate_to_datetime(published).isoformat()
-                except (TypeError, ValueError):
-                    pass
-
-            results.append({
-                "headline": headline,
-                "link": link,
-                "content": summary,
-                "editorial_summary": True,
-                "image": image or None,
-                "timestamp": timestamp,
-            })
+                results.append({
+                    "headline": headline,
+                    "link": link,
+                    "content": item["summary"],
+                    "editorial_summary": True,
+                    "image": item["image"],
+                    "timestamp": item["published"] and item["published"].isoformat(),
+                })
+        finally:
+            response.close()
 
+        validator_cache.store(key, feed_url, response, results)
         return results
     except Exception as e:
+        feed_marks.discard(feed_url)
         print(f"❌ Error scraping RSS feed: {e}")
         return []
 
@@ -117,32 +151,21 @@ def scrape_rss_feed(feed_url):
 # ✅ Function to scrape dynamic websites (e.g., Reuters, CBC)
 def scrape_dynamic_website(base_url, headline_xpath, link_xpath):
     """Uses Selenium for sites requiring JavaScript rendering."""
+    if replay_mode():
+        print(f"⏭️ Browser pages are not recorded; skipping {base_url}")
+        return []
     try:
-        driver = webdriver.Edge()
-        driver.get(base_url)
-
-        try:
+        with driver_pool.driver() as driver:
+            driver.get(base_url)
             WebDriverWait(driver, 15).until(
                 EC.presence_of_element_located((By.XPATH, headline_xpath))
             )
             page_source = driver.page_source
-        finally:
-            driver.quit()
 
         tree = html.fromstring(page_source)
-        articles = tree.xpath(headline_xpath)
-        results = []
-
-        for article in articles:
-            headline = article.xpath(".//h3/text() | .//span/text()")
-            link = article.xpath(link_xpath)
-            if headline and link:
-                text = headline[0].strip()
-                full_link = link[0].strip()
-                if not full_link.startswith("http"):
-                    full_link = urljoin(base_url, full_link)
-                results.append({"headline": text, "link": full_link})
-
+        results = extract_rendered_entries(
+            tree, base_url, headline_xpath, link_xpath
+        )
         return filter_results(results)
 
     except Exception as e:
@@ -150,18 +173,87 @@ def scrape_dynamic_website(base_url, headline_xpath, link_xpath):
         return []
 
 
+# ── STATIC-FIRST PROBING ────────────────────────────────────────────────────
+SCRAPE_MODES_FILE = "scrape_modes.json"
+_modes_lock = threading.Lock()
+_scrape_modes = None
+
+
+def _remembered_mode(site):
+    """Return the listing path that last worked for ``site`` if still fresh."""
+    global _scrape_modes
+    with _modes_lock:
+        if _scrape_modes is None:
+            _scrape_modes = load_json(SCRAPE_MODES_FILE, {})
+        entry = _scrape_modes.get(site) or {}
+    if entry.get("mode") != "dynamic":
+        return entry.get("mode")
+    # Re-probe browser-only sites now and then in case they moved their
+    # headlines back into the server-rendered HTML.
+    reprobe_days = int(os.getenv("NEWS_STATIC_REPROBE_DAYS", "7") or 7)
+    try:
+        checked = datetime.datetime.fromisoformat(entry["checked"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    age = datetime.datetime.now(datetime.timezone.utc) - checked
+    return "dynamic" if age < datetime.timedelta(days=reprobe_days) else None
+
+
+def _remember_mode(site, mode):
+    with _modes_lock:
+        _scrape_modes[site] = {
+            "mode": mode,
+            "checked": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        }
+        save_json(SCRAPE_MODES_FILE, _scrape_modes)
+
+
+def scrape_probed_website(site, base_url, headline_xpath, link_xpath):
+    """Try the plain HTTP path for a dynamic site before starting a browser.
+
+    Selenium is used only when the headline XPath matches nothing in the
+    server-rendered HTML. The path that worked is remembered per site in
+    the run cache so later runs go straight to it.
+    """
+    if _remembered_mode(site) != "dynamic":
+        try:
+            results = _static_listing(
+                base_url,
+                headline_xpath,
+                link_xpath,
+                extract_rendered_entries,
+                "rendered",
+            )
+        except Exception as e:
+            print(f"⚠️ Static probe failed for {site}: {e}")
+            results = []
+        if results:
+            _remember_mode(site, "static")
+            return results
+        print(f"🌐 {site}: no headlines in static HTML; using the browser")
+
+    results = scrape_dynamic_website(base_url, headline_xpath, link_xpath)
+    if results:
+        _remember_mode(site, "dynamic")
+    return results
+
+
+def scrape_listing(site, cfg):
+    """Fetch the candidate article list for one registered site."""
+    if cfg.rss_url:
+        return scrape_rss_feed(cfg.rss_url)
+    if cfg.dynamic:
+        return scrape_probed_website(
+            site, cfg.base_url, cfg.headline_xpath, cfg.link_xpath
+        )
+    return scrape_static_website(cfg.base_url, cfg.headline_xpath, cfg.link_xpath)
+
+
 # ✅ Main Execution
 if __name__ == "__main__":
     for site, config in WEBSITE_CONFIG.items():
         print(f"📰 Scraping: {site}")
-        base_url = config["base_url"]
-        headline_xpath = config["headline_xpath"]
-        link_xpath = config["link_xpath"]
-
-        if config["dynamic"]:
-            articles = scrape_dynamic_website(base_url, headline_xpath, link_xpath)
-        else:
-            articles = scrape_static_website(base_url, headline_xpath, link_xpath)
+        articles = scrape_listing(site, config)
 
         if articles:
             print(f"✅ {site.capitalize()} Articles:")
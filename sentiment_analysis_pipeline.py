@@ -1,27 +1,44 @@
 from __future__ import annotations
 
 import json
-import cloudscraper
-import certifi
 import os
-import subprocess
-import time
+import threading
 import unicodedata
 import re
+import time
 import traceback
 import datetime
 import html as _html
-from lxml import html as lxml_html
-from selector_scraper import (
-    scrape_dynamic_website,
-    scrape_rss_feed,
-    scrape_static_website,
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from selector_scraper import scrape_listing
+from feed_reader import feed_marks
+from site_registry import SiteConfig, compiled_xpath, load_sites
+from transports import transport_selector
+from browser_pool import driver_pool
+from fetch_scheduler import FetchScheduler
+from http_cache import validator_cache
+from html_store import html_store
+from http_sessions import close_sessions, get_session
+from analysis_cache import (
+    analysis_cache,
+    analyzer_versions,
+    cached_bias,
+    cached_entities,
+    cached_sentiments,
 )
-from keyword_extractor import extract_entities
-from feed_data import analyze_keywords
-from political_bias import analyze_political_bias
+from onnx_backend import onnx_pipeline
 from save2db import save_articles_to_db
-from article_quality import clean_article_text, clean_headline, is_junk_article
+from site_stats import adaptive_budgets_enabled, site_stats
+from url_index import ProcessedUrlIndex, load_processed_urls
+from article_extract import article_parser, extract_article
+from article_quality import (
+    RuleMatcher,
+    classify_junk,
+    clean_article_text,
+    clean_headline,
+    cleaning_cache_stats,
+)
 
 # ── Generic headline blacklist ──────────────────────────────────────────────
 # any headline matching these (case-insensitive) patterns will be skipped
@@ -35,13 +52,16 @@ GENERIC_HEADLINE_PATTERNS = [
     r"\b(crossword|sudoku|strands|wordle|the new york times games|nyt games)\b",
     r"\b(work for us|sign up|terms\s*&\s*conditions|careers?)\b",
 ]
+GENERIC_HEADLINE_RULES = RuleMatcher({"GENERIC_HEADLINE_PATTERNS": GENERIC_HEADLINE_PATTERNS})
 
 # ── CONFIG ──────────────────────────────────────────────────────────────────
-with open("news_sites.json", "r", encoding="utf-8") as f:
-    WEBSITE_CONFIG = json.load(f)
+WEBSITE_CONFIG = load_sites()
+transport_selector.configure_sites(WEBSITE_CONFIG)
 
 summarizer = None
 nlp_trf = None
+# Sites may be processed on worker threads; load each model only once.
+_model_lock = threading.Lock()
 
 
 def transformer_device():
@@ -80,6 +100,7 @@ _BOILERPLATE = [
     "sign up for our email", "privacy policy", "terms of use",
     "contact us", "advertise with us", "help", "accessibility"
 ]
+_BOILERPLATE_RULES = RuleMatcher({"_BOILERPLATE": _BOILERPLATE}, flags=0, literal=True)
 
 # ── TEXT CLEANING ───────────────────────────────────────────────────────────
 def clean_text(text: str) -> str:
@@ -102,52 +123,123 @@ def clean_text(text: str) -> str:
         return text
 
 # ── SUMMARY CLEANING ────────────────────────────────────────────────────────
-def clean_summary(text: str) -> str:
-    try:
-        if not isinstance(text, str) or not text.strip():
-            return ""
-        txt = clean_text(text)
-        txt = clean_article_text(txt)
-        for pat in _MAINT_PATTERNS:
-            txt = re.sub(pat, "", txt, flags=re.I)
-        parts = [
-            p for p in txt.split(". ")
-            if not any(bp in p.lower() for bp in _BOILERPLATE)
-        ]
-        txt = ". ".join(parts)
-        txt = _CAP_RE.sub(lambda m: m.group(1) + m.group(2).upper(), txt)
-        txt = re.sub(r'\b(am|pm)\b', lambda m: m.group(1).upper(), txt, flags=re.I)
-        try:
-            global nlp_trf
-            if nlp_trf is None:
+_nlp_error = None
+
+
+def summary_nlp():
+    """en_core_web_trf for proper-noun recasing, or None if it can't load.
+
+    A load failure is reported once per run; summaries then keep their
+    casing from the regex passes.
+    """
+    global nlp_trf, _nlp_error
+    with _model_lock:
+        if nlp_trf is None and _nlp_error is None:
+            try:
                 import spacy
 
                 spacy.prefer_gpu()
-                nlp_trf = spacy.load(
-                    "en_core_web_trf", disable=["parser", "lemmatizer"]
-                )
-            doc = nlp_trf(txt)
-            tokens = []
-            for tok in doc:
-                if tok.text.islower() and tok.pos_ == "PROPN":
-                    tokens.append(tok.text.capitalize())
-                else:
-                    tokens.append(tok.text)
-            txt = " ".join(tokens)
-        except Exception:
-            pass
-        txt = re.sub(r'\s+([.,!?;:])', r'\1', txt)
-        txt = re.sub(r'([.,!?;:])([^\s])', r'\1 \2', txt)
-        txt = re.sub(r'\.\s+(\d)', r'.\1', txt)
-        txt = re.sub(r' {2,}', ' ', txt)
-        txt = txt.strip()
-        if txt and txt[-1] not in ".!?":
-            txt += "."
-        return txt
-    except Exception as e:
-        print("❌ clean_summary error:", e)
-        traceback.print_exc()
-        return text.strip()
+                nlp_trf = spacy.load("en_core_web_trf", disable=["parser", "lemmatizer"])
+            except Exception as e:
+                _nlp_error = e
+                print(f"⚠️ spaCy model unavailable; summaries are not recased: {e}")
+        return nlp_trf
+
+
+def summary_draft(text: str) -> str:
+    """``clean_summary`` without the spaCy recasing pass.
+
+    Accept/reject decisions are made on the draft; ``clean_summaries``
+    produces the stored text for a whole run at once.
+    """
+    return _finish_summary(_prepare_summary(text))
+
+
+def _prepare_summary(text: str) -> str:
+    if not isinstance(text, str) or not text.strip():
+        return ""
+    txt = clean_text(text)
+    txt = clean_article_text(txt)
+    for pat in _MAINT_PATTERNS:
+        txt = re.sub(pat, "", txt, flags=re.I)
+    parts = [
+        p for p in txt.split(". ")
+        if not _BOILERPLATE_RULES(p.lower())
+    ]
+    txt = ". ".join(parts)
+    txt = _CAP_RE.sub(lambda m: m.group(1) + m.group(2).upper(), txt)
+    return re.sub(r'\b(am|pm)\b', lambda m: m.group(1).upper(), txt, flags=re.I)
+
+
+def _recase(doc) -> str:
+    tokens = []
+    for tok in doc:
+        if tok.text.islower() and tok.pos_ == "PROPN":
+            tokens.append(tok.text.capitalize())
+        else:
+            tokens.append(tok.text)
+    return " ".join(tokens)
+
+
+def _finish_summary(txt: str) -> str:
+    if not txt:
+        return ""
+    txt = re.sub(r'\s+([.,!?;:])', r'\1', txt)
+    txt = re.sub(r'([.,!?;:])([^\s])', r'\1 \2', txt)
+    txt = re.sub(r'\.\s+(\d)', r'.\1', txt)
+    txt = re.sub(r' {2,}', ' ', txt)
+    txt = txt.strip()
+    if txt and txt[-1] not in ".!?":
+        txt += "."
+    return txt
+
+
+def clean_summaries(texts: list[str]) -> list[str]:
+    """Clean many summaries, recasing proper nouns in one ``nlp.pipe`` pass.
+
+    ``NEWS_SPACY_BATCH_SIZE`` (default 32) and ``NEWS_SPACY_PROCESSES``
+    (default 1) are handed to ``nlp.pipe``.
+    """
+    prepared = []
+    for text in texts:
+        try:
+            prepared.append(_prepare_summary(text))
+        except Exception as e:
+            print("❌ clean_summary error:", e)
+            traceback.print_exc()
+            prepared.append(None)
+
+    nlp = summary_nlp() if any(prepared) else None
+    recased = list(prepared)
+    if nlp is not None:
+        todo = [index for index, txt in enumerate(prepared) if txt]
+        try:
+            docs = nlp.pipe(
+                (prepared[index] for index in todo),
+                batch_size=int(os.getenv("NEWS_SPACY_BATCH_SIZE", "32") or 32),
+                n_process=int(os.getenv("NEWS_SPACY_PROCESSES", "1") or 1),
+            )
+            for index, doc in zip(todo, docs):
+                recased[index] = _recase(doc)
+        except Exception as e:
+            print(f"⚠️ spaCy recasing failed for this batch: {e}")
+            recased = list(prepared)
+
+    cleaned = []
+    for text, txt in zip(texts, recased):
+        if txt is None:
+            cleaned.append(text.strip() if isinstance(text, str) else "")
+            continue
+        try:
+            cleaned.append(_finish_summary(txt))
+        except Exception as e:
+            print("❌ clean_summary error:", e)
+            cleaned.append(text.strip())
+    return cleaned
+
+
+def clean_summary(text: str) -> str:
+    return clean_summaries([text])[0]
 
 # ── ARTICLE FETCH ──────────────────────────────────────────────────────────
 def fix_guardian_link(link: str) -> str:
@@ -155,13 +247,18 @@ def fix_guardian_link(link: str) -> str:
         return "https://www.theguardian.com" + link.split("#")[0]
     return link
 
+OG_IMAGE = compiled_xpath("//meta[@property='og:image']/@content")
+TWITTER_IMAGE = compiled_xpath("//meta[@name='twitter:image']/@content")
+ARTICLE_IMAGES = compiled_xpath("//article//img/@src")
+PAGE_IMAGES = compiled_xpath("//img/@src")
+
 def extract_image(tree) -> str | None:
     try:
-        og = tree.xpath("//meta[@property='og:image']/@content")
+        og = OG_IMAGE(tree)
         if og: return og[0]
-        tw = tree.xpath("//meta[@name='twitter:image']/@content")
+        tw = TWITTER_IMAGE(tree)
         if tw: return tw[0]
-        imgs = tree.xpath("//article//img/@src") + tree.xpath("//img/@src")
+        imgs = ARTICLE_IMAGES(tree) + PAGE_IMAGES(tree)
         for u in imgs:
             if u.startswith("http"):
                 return u
@@ -172,31 +269,108 @@ def extract_image(tree) -> str | None:
 
 
 def parse_article_html(content: bytes) -> tuple[str, str | None]:
-    tree = lxml_html.fromstring(content)
-    article_paras = tree.xpath(
-        "//article//p//text() | "
-        "//div[contains(@class, 'article__content')]//p//text()"
-    )
-    paras = article_paras or tree.xpath("//p//text()")
-    text = clean_article_text(" ".join(paras).strip()) or "Content not available"
-    return text, extract_image(tree)
-
-
-def fetch_with_curl(url: str) -> bytes:
-    command = [
-        "/usr/bin/curl" if os.path.exists("/usr/bin/curl") else "curl",
-        "--fail",
-        "--location",
-        "--silent",
-        "--show-error",
-        "--max-time",
-        "30",
-        "--user-agent",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 Chrome/126.0 Safari/537.36",
-        url,
-    ]
-    return subprocess.run(command, check=True, capture_output=True).stdout
+    text, image = extract_article(content)
+    return clean_article_text(text) or "Content not available", image
+
+
+# ── BOUNDED FETCHING ───────────────────────────────────────────────────────
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+CHUNK_SIZE = 64 * 1024
+
+fetch_metrics = Counter()
+junk_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+class ArticleRejected(Exception):
+    """The response is not worth parsing (wrong type or over the size cap)."""
+
+
+def count_metric(name: str, amount: int = 1) -> None:
+    with _metrics_lock:
+        fetch_metrics[name] += amount
+
+
+def count_junk(reason: str) -> None:
+    """Tally which junk rule rejected a candidate, for the end-of-run report."""
+    with _metrics_lock:
+        junk_metrics[reason] += 1
+
+
+def max_article_bytes() -> int:
+    return int(os.getenv("NEWS_MAX_ARTICLE_BYTES", str(4 * 1024 * 1024)) or 0)
+
+
+def skip_oversize_articles() -> bool:
+    """``NEWS_OVERSIZE_ARTICLES=skip`` drops capped pages instead of truncating."""
+    return os.getenv("NEWS_OVERSIZE_ARTICLES", "truncate").lower() == "skip"
+
+
+def parse_article_chunks(
+    url: str,
+    chunks,
+    content_type: str = "",
+    content_length: str | int | None = None,
+) -> tuple[str, str | None]:
+    """Feed response chunks straight into the streaming article parser.
+
+    Non-HTML responses are rejected from their headers before the body is
+    read. Bodies over ``NEWS_MAX_ARTICLE_BYTES`` are truncated at the cap, or
+    rejected when ``NEWS_OVERSIZE_ARTICLES=skip``; both outcomes are counted
+    in ``fetch_metrics``.
+    """
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type and media_type not in HTML_CONTENT_TYPES:
+        count_metric("rejected_non_html")
+        raise ArticleRejected(f"not HTML ({media_type})")
+    cap = max_article_bytes()
+    declared = int(content_length or 0) if str(content_length or "").isdigit() else 0
+    if cap and declared > cap and skip_oversize_articles():
+        count_metric("skipped_oversize")
+        raise ArticleRejected(f"declared {declared} bytes exceeds the {cap} byte cap")
+
+    parser = article_parser()
+    total = 0
+    truncated = False
+    # Chunks are compressed into the HTML store as they arrive, so the body
+    # is never held in memory; a rejected or unparsable body leaves nothing
+    # stored.
+    with html_store.writer(url) as page:
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if cap and total + len(chunk) > cap:
+                chunk = chunk[: cap - total]
+                truncated = True
+            parser.feed(chunk)
+            page.write(chunk)
+            total += len(chunk)
+            if truncated:
+                break
+        count_metric("bytes_read", total)
+        if truncated:
+            if skip_oversize_articles():
+                count_metric("skipped_oversize")
+                raise ArticleRejected(f"body exceeds the {cap} byte cap")
+            count_metric("truncated_oversize")
+            print(f"⚠️ Truncated {url} at {cap} bytes")
+        if not total:
+            raise ArticleRejected("empty response body")
+        text, image = parser.close()
+    count_metric("articles_fetched")
+    return clean_article_text(text) or "Content not available", image
+
+
+def cached_article(url: str) -> tuple[str, str | None] | None:
+    """Parse ``url`` from the local HTML store, or None when it is not cached."""
+    content = html_store.get(url)
+    if content is None:
+        return None
+    try:
+        return parse_article_html(content)
+    except Exception as e:
+        print(f"❌ cached page parse error for {url}: {e}")
+        return None
 
 def fetch_full_article(url: str) -> tuple[str, str | None]:
     HEADERS = {
@@ -206,58 +380,311 @@ def fetch_full_article(url: str) -> tuple[str, str | None]:
         "Accept-Language": "en-US,en;q=0.9",
         "Referer": "https://www.google.com/",
     }
-    try:
-        scraper = cloudscraper.create_scraper(
-            browser={'browser': 'chrome', 'platform': 'windows'}
-        )
-        # Option A – set once for the whole session
-        scraper.verify = certifi.where()
+    cached = cached_article(url)
+    if cached is not None:
+        return cached
+    errors = []
+    for transport in transport_selector.order_for(url):
+        try:
+            resp = get_session(url, transport).get(
+                url, headers=HEADERS, timeout=30, stream=True
+            )
+            try:
+                resp.raise_for_status()
+                result = parse_article_chunks(
+                    url,
+                    resp.iter_content(CHUNK_SIZE),
+                    resp.headers.get("Content-Type", ""),
+                    resp.headers.get("Content-Length"),
+                )
+            finally:
+                resp.close()
+            transport_selector.record_success(url, transport)
+            return result
+
+        except ArticleRejected as e:
+            print(f"⚠️ Skipped {url}: {e}")
+            return "Content not available", None
+        except Exception as e:
+            count_metric(f"failed_{transport}")
+            errors.append(f"{transport}: {e}")
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status in {404, 410}:
+                break
+    print(f"❌ fetch_full_article error for {url}: {'; '.join(errors)}")
+    return "Content not available", None
 
-        resp = scraper.get(url, headers=HEADERS, timeout=30)
-        resp.raise_for_status()
+_fetch_scheduler = None
+_fetch_scheduler_lock = threading.Lock()
 
-        return parse_article_html(resp.content)
 
-    except Exception as e:
-        if "cnn.com" in url:
-            try:
-                return parse_article_html(fetch_with_curl(url))
-            except Exception as curl_error:
-                print(f"❌ CNN curl fallback failed for {url}: {curl_error}")
-        print(f"❌ fetch_full_article error for {url}: {e}")
-        return "Content not available", None
+def fetch_scheduler() -> FetchScheduler:
+    """Shared article fetch pool, rate limited per host from news_sites.json."""
+    global _fetch_scheduler
+    with _fetch_scheduler_lock:
+        if _fetch_scheduler is None:
+            _fetch_scheduler = FetchScheduler(
+                fetch_full_article, cached=cached_article
+            )
+            _fetch_scheduler.configure_sites(WEBSITE_CONFIG)
+        return _fetch_scheduler
+
+
+def close_fetch_scheduler() -> None:
+    """Stop the fetch pool and its timer thread, dropping any parked fetches."""
+    global _fetch_scheduler
+    with _fetch_scheduler_lock:
+        if _fetch_scheduler is not None:
+            _fetch_scheduler.shutdown()
+            _fetch_scheduler = None
 
 # ── SUMMARY GENERATION ─────────────────────────────────────────────────────
-def generate_summary(text: str) -> str:
+def summary_source(text: str) -> str:
+    """Raw summary text for an article body, before ``clean_summary``."""
     try:
         if len(text.split()) < 10:
-            return clean_summary(text)
+            return text
         fast_summary = (
             os.getenv("NEWS_SUMMARY_FAST")
             or os.getenv("NEWS_PIPELINE_FAST", "")
         ).lower() in {"1", "true", "yes"}
         if fast_summary:
             sentences = re.split(r"(?<=[.!?])\s+", text)
-            return clean_summary(" ".join(sentences[:2])[:450])
+            return " ".join(sentences[:2])[:450]
         global summarizer
-        if summarizer is None:
-            from transformers import pipeline
-
-            summarizer = pipeline(
-                "summarization",
-                model="t5-large",
-                device=transformer_device(),
-            )
-        out = summarizer(
+        with _model_lock:
+            if summarizer is None:
+                summarizer = onnx_pipeline("summarization", "t5-large")
+            if summarizer is None:
+                from transformers import pipeline
+
+                summarizer = pipeline(
+                    "summarization",
+                    model="t5-large",
+                    device=transformer_device(),
+                )
+        return summarizer(
             "summarize: " + text[:2048],
             min_length=50, do_sample=False
         )[0]["summary_text"]
-        return clean_summary(out)
     except Exception as e:
         print("❌ generate_summary error:", e)
-        return clean_summary(text[:300] + "...")
+        return text[:300] + "..."
+
+
+def generate_summary(text: str) -> str:
+    return clean_summary(summary_source(text))
 
 # ── MAIN SCRAPE LOOP ───────────────────────────────────────────────────────
+def site_concurrency() -> int:
+    """Number of publishers scraped at once (``NEWS_SITE_CONCURRENCY``)."""
+    return max(1, int(os.getenv("NEWS_SITE_CONCURRENCY", "1") or 1))
+
+
+def skip_unchanged_sites() -> bool:
+    return os.getenv("NEWS_SKIP_UNCHANGED_SITES", "1").lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+def skip_known_urls() -> bool:
+    return os.getenv("NEWS_SKIP_KNOWN_URLS", "1").lower() not in {
+        "0",
+        "false",
+        "no",
+    }
+
+
+def process_site(
+    site: str,
+    cfg: SiteConfig,
+    max_articles_per_site: int = 0,
+    max_attempts_per_site: int = 0,
+    known_urls: ProcessedUrlIndex | None = None,
+) -> list[dict]:
+    """Scrape one publisher and return its analyzed articles in listing order.
+
+    Links in ``known_urls`` were stored by an earlier run; they are skipped
+    without counting against the attempt budget. Yield counters are added to
+    ``site_stats`` for the next run's budget.
+    """
+    print("📰 Scraping:", site)
+    started = time.monotonic()
+    run = Counter()
+    arts = scrape_listing(site, cfg)
+    # A 304 on the listing means every article on it was handled last run.
+    if skip_unchanged_sites() and validator_cache.is_unchanged(cfg.listing_url):
+        print(f"⏭️ {site} unchanged since the last run; skipping")
+        return []
+    run["listed"] = len(arts)
+    max_attempts_per_site = site_stats.attempt_budget(
+        site, max_attempts_per_site, max_articles_per_site
+    )
+
+    # Headline checks are cheap, so apply the attempt budget and filters up
+    # front; the remaining candidates are fetched ahead of the analysis loop.
+    candidates = []
+    # Listing entries examined up to and including each candidate.
+    reached = []
+    seen = set()
+    attempts_for_site = 0
+    truncated = False
+    for a in arts:
+        link = fix_guardian_link(a["link"]) if site == "guardian" else a["link"]
+        if known_urls is not None and link in known_urls:
+            continue
+        if max_attempts_per_site and attempts_for_site >= max_attempts_per_site:
+            truncated = True
+            break
+        attempts_for_site += 1
+        head = clean_headline(clean_text(a["headline"]))
+        # skip obviously generic/uninteresting headlines
+        reason = GENERIC_HEADLINE_RULES.match(head.strip().lower()) or classify_junk(
+            head, link
+        )
+        if reason:
+            run["junk"] += 1
+            count_junk(reason)
+            continue
+        if link in seen:
+            continue
+        seen.add(link)
+        candidates.append((a, head, link))
+        reached.append(attempts_for_site)
+
+    fetched = fetch_scheduler().iter_results(
+        link
+        for a, _head, link in candidates
+        if a.get("editorial_summary") or not a.get("content")
+    )
+    records = []
+    processed_for_site = 0
+    try:
+        for index, (a, head, link) in enumerate(candidates):
+            if max_articles_per_site and processed_for_site >= max_articles_per_site:
+                # Entries from this candidate on were filtered but never
+                # analyzed; counting them would understate the site's yield.
+                attempts_for_site = reached[index] - 1
+                truncated = True
+                break
+            record = analyze_candidate(a, head, link, fetched, run)
+            if record is None:
+                continue
+            records.append(record)
+            processed_for_site += 1
+            print(f"✅ Accepted: {head}")
+    finally:
+        fetched.close()
+
+    # Items left over by a budget or a failed fetch are still new next run;
+    # keep the feed's previous high-water mark and listing validators so
+    # neither the RSS cutoff nor a 304 skips them.
+    if truncated or run["fetch_failures"]:
+        validator_cache.discard(cfg.listing_url)
+        if cfg.rss_url:
+            feed_marks.discard(cfg.rss_url)
+
+    run["attempts"] = attempts_for_site
+    run["accepted"] = len(records)
+    run["seconds"] = round(time.monotonic() - started, 1)
+    site_stats.record(site, run)
+    print(
+        f"📈 {site}: {run['listed']} listed, {run['attempts']} attempted, "
+        f"{run['junk']} junk, {run['fetch_failures']} failed fetches, "
+        f"{run['accepted']} accepted in {run['seconds']}s "
+        f"(budget {max_attempts_per_site or 'unlimited'})"
+    )
+    return records
+
+
+def analyze_candidate(
+    a: dict, head: str, link: str, fetched, run: Counter | None = None
+) -> dict | None:
+    """Build the stored record for one listing entry, or None to discard it.
+
+    Rejections are counted in ``run`` as ``fetch_failures`` or ``junk``.
+    Decisions use the summary draft; ``finalize_records`` later fills in the
+    cleaned summary, sentiment and entities.
+    """
+    run = Counter() if run is None else run
+    content = a.get("content")
+    img = a.get("image")
+    uses_editorial_summary = bool(a.get("editorial_summary"))
+    bias_content = content
+    if uses_editorial_summary:
+        full_content, fetched_img = next(fetched)
+        if full_content != "Content not available":
+            bias_content = full_content
+            img = img or fetched_img
+            if not content:
+                content = full_content
+                uses_editorial_summary = False
+    elif not content:
+        content, img = next(fetched)
+        bias_content = content
+    if not content or content == "Content not available":
+        run["fetch_failures"] += 1
+        return None
+
+    source = content if uses_editorial_summary else summary_source(content)
+    summ = summary_draft(source)
+    reason = classify_junk(head, link, summ)
+    if reason:
+        run["junk"] += 1
+        count_junk(reason)
+        return None
+
+    # 10% token overlap guard
+    hset = set(re.findall(r"\b\w+\b", head.lower()))
+    sset = set(re.findall(r"\b\w+\b", summ.lower()))
+    if (
+        not uses_editorial_summary
+        and len(hset & sset) / (len(hset) + 1) < 0.10
+    ):
+        print("⚠️ Discarded – summary/headline mismatch")
+        run["junk"] += 1
+        return None
+
+    bias_result = cached_bias(bias_content or content, head)
+
+    return {
+        "headline": head,
+        "url": link,
+        "sentiment": None,
+        "sentiment_method": None,
+        "sentiment_score": None,
+        **bias_result,
+        "summary": summ,
+        "image": img,
+        "timestamp": a.get("timestamp")
+        or datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "entities": [],
+        "_summary_source": source,
+    }
+
+
+def finalize_records(records: list[dict]) -> None:
+    """Clean every summary of the run in one batch, then score the records."""
+    summaries = clean_summaries([record.pop("_summary_source") for record in records])
+    sentiments = cached_sentiments(
+        [(record["headline"], summ) for record, summ in zip(records, summaries)]
+    )
+    # Same input as cleanup_articles, so equal entity stamps mean equal results.
+    entities = cached_entities(
+        [f"{record['headline']}. {summ}" for record, summ in zip(records, summaries)]
+    )
+    for record, summ, sentiment_result, names in zip(records, summaries, sentiments, entities):
+        record["summary"] = summ
+        record["sentiment"] = sentiment_result["final_sentiment"]
+        record["sentiment_method"] = sentiment_result.get("method")
+        record["sentiment_score"] = sentiment_result.get("score")
+        record["entities"] = names
+        record["analyzer_versions"] = analyzer_versions(record.get("bias_method"))
+        print(f"{record['sentiment'].capitalize()}: {record['headline']}")
+
+
 def process_news():
     results = {"positive": [], "neutral": [], "negative": []}
     selected_sites = {
@@ -273,102 +700,72 @@ def process_news():
         )
         or 0
     )
-
-    for site, cfg in WEBSITE_CONFIG.items():
-        if selected_sites and site.lower() not in selected_sites:
-            continue
-        print("📰 Scraping:", site)
-        if cfg.get("rss_url"):
-            arts = scrape_rss_feed(cfg["rss_url"])
-        elif cfg["dynamic"]:
-            arts = scrape_dynamic_website(
-                cfg["base_url"], cfg["headline_xpath"], cfg["link_xpath"]
+    sites = [
+        (site, cfg)
+        for site, cfg in WEBSITE_CONFIG.items()
+        if not selected_sites or site.lower() in selected_sites
+    ]
+    if max_attempts_per_site and adaptive_budgets_enabled():
+        budgets = {
+            site: site_stats.attempt_budget(
+                site, max_attempts_per_site, max_articles_per_site
             )
-        else:
-            arts = scrape_static_website(
-                cfg["base_url"], cfg["headline_xpath"], cfg["link_xpath"]
+            for site, _cfg in sites
+        }
+        print("🎯 Attempt budgets:", budgets)
+
+    known_urls = load_processed_urls() if skip_known_urls() else None
+    if known_urls is not None:
+        print(f"🗂️ {len(known_urls)} previously processed URLs will be skipped")
+
+    # Every site runs its listing scrape and article loop as one task, so a
+    # slow publisher only delays itself. The most productive sites are
+    # submitted first; results are merged in config order to keep the JSON
+    # snapshot deterministic regardless of completion order. Summaries are
+    # recased and scored for the whole run afterwards, in one batch.
+    workers = min(site_concurrency(), len(sites)) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            site: pool.submit(
+                process_site,
+                site,
+                cfg,
+                max_articles_per_site,
+                max_attempts_per_site,
+                known_urls,
             )
+            for site, cfg in site_stats.order(sites)
+        }
+        records = [record for site, _cfg in sites for record in futures[site].result()]
 
-        seen = set()
-        processed_for_site = 0
-        attempts_for_site = 0
-        for a in arts:
-            if max_articles_per_site and processed_for_site >= max_articles_per_site:
-                break
-            if max_attempts_per_site and attempts_for_site >= max_attempts_per_site:
-                break
-            attempts_for_site += 1
-            head = clean_headline(clean_text(a["headline"]))
-            # skip obviously generic/uninteresting headlines
-            low = head.strip().lower()
-            if any(re.search(pat, low) for pat in GENERIC_HEADLINE_PATTERNS):
-                continue
-            link = fix_guardian_link(a["link"]) if site == "guardian" else a["link"]
-            if is_junk_article(head, link):
-                continue
-            if link in seen:
-                continue
-            seen.add(link)
-
-            content = a.get("content")
-            img = a.get("image")
-            uses_editorial_summary = bool(a.get("editorial_summary"))
-            bias_content = content
-            if uses_editorial_summary:
-                full_content, fetched_img = fetch_full_article(link)
-                if full_content != "Content not available":
-                    bias_content = full_content
-                    img = img or fetched_img
-                    if not content:
-                        content = full_content
-                        uses_editorial_summary = False
-            elif not content:
-                content, img = fetch_full_article(link)
-                bias_content = content
-            if not content or content == "Content not available":
-                continue
-
-            summ = clean_summary(content) if uses_editorial_summary else generate_summary(content)
-            if is_junk_article(head, link, summ):
-                continue
-
-            # 10% token overlap guard
-            hset = set(re.findall(r"\b\w+\b", head.lower()))
-            sset = set(re.findall(r"\b\w+\b", summ.lower()))
-            if (
-                not uses_editorial_summary
-                and len(hset & sset) / (len(hset) + 1) < 0.10
-            ):
-                print("⚠️ Discarded – summary/headline mismatch")
-                continue
-
-            sentiment_result = analyze_keywords(head, summ)
-            sentiment = sentiment_result["final_sentiment"]
-            bias_result = analyze_political_bias(bias_content or content, head)
-            entities = extract_entities(summ)
-
-            results[sentiment].append({
-                "headline": head,
-                "url": link,
-                "sentiment": sentiment,
-                "sentiment_method": sentiment_result.get("method"),
-                "sentiment_score": sentiment_result.get("score"),
-                **bias_result,
-                "summary": summ,
-                "image": img,
-                "timestamp": a.get("timestamp")
-                or datetime.datetime.now(datetime.timezone.utc).isoformat(),
-                "entities": entities
-            })
-            processed_for_site += 1
-
-            print(f"{sentiment.capitalize()}: {head}")
-            time.sleep(1)
+    finalize_records(records)
+    for record in records:
+        results[record["sentiment"]].append(record)
 
     with open("sentiment_results.json", "w", encoding="utf-8") as f:
         json.dump(results, f, indent=4, default=str)
 
+    close_fetch_scheduler()
+    close_sessions()
+    driver_pool.close()
+    if fetch_metrics:
+        print("📊 Article fetches:", dict(sorted(fetch_metrics.items())))
+    if junk_metrics:
+        print("🧹 Junk rules fired:")
+        for reason, count in junk_metrics.most_common(10):
+            print(f"   {count:>4} × {reason}")
+    print("♻️ Text cleaning cache:", cleaning_cache_stats())
+    print("♻️ Analysis cache:", analysis_cache.stats())
+    analysis_cache.close()
+
     save_articles_to_db(json_file="sentiment_results.json")
+    if known_urls is not None:
+        for record in records:
+            known_urls.add(record["url"])
+        known_urls.save()
+    feed_marks.commit()
+    validator_cache.commit()
+    site_stats.save()
     print("✅ Sentiment Analysis Complete!")
 
 if __name__ == "__main__":
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from array import array
+
+LABELS = ("negative", "neutral", "positive")
+DEFAULT_BUCKETS = 1 << 14
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sentiment_linear.json.gz")
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def linear_tier_enabled() -> bool:
+    return os.getenv("NEWS_SENTIMENT_LINEAR", "1").lower() not in {"0", "false", "no"}
+
+
+def margin_threshold() -> float:
+    return float(os.getenv("NEWS_SENTIMENT_MARGIN", "0.5") or 0.5)
+
+
+def hashed_features(text: str, buckets: int) -> dict[int, float]:
+    """Unigram and bigram presence, hashed into ``buckets`` and L2-normalized."""
+    tokens = _TOKEN.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    features: dict[int, float] = {}
+    for gram in grams:
+        features[zlib.crc32(gram.encode("utf-8")) % buckets] = 1.0
+    if features:
+        scale = 1.0 / math.sqrt(len(features))
+        for bucket in features:
+            features[bucket] = scale
+    return features
+
+
+def _softmax(scores: list[float]) -> list[float]:
+    top = max(scores)
+    exps = [math.exp(score - top) for score in scores]
+    total = sum(exps)
+    return [value / total for value in exps]
+
+
+class HashedLinearModel:
+    """Multinomial logistic regression over hashed bag-of-words features.
+
+    Trained offline on the transformer's own labels (``train_sentiment_linear.py``)
+    and stored as one small gzip JSON file with float32 weights. ``predict``
+    costs one dictionary build and a few hundred multiply-adds.
+    """
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS, labels=LABELS):
+        self.buckets = buckets
+        self.labels = tuple(labels)
+        self.bias = [0.0] * len(self.labels)
+        # Row-major: weights[label * buckets + bucket].
+        self.weights = array("f", bytes(4 * buckets * len(self.labels)))
+
+    def probabilities(self, text: str) -> list[float]:
+        features = hashed_features(text, self.buckets)
+        scores = list(self.bias)
+        for label in range(len(self.labels)):
+            offset = label * self.buckets
+            scores[label] += sum(
+                self.weights[offset + bucket] * value for bucket, value in features.items()
+            )
+        return _softmax(scores)
+
+    def predict(self, text: str) -> tuple[str, float, float]:
+        """Return ``(label, probability, margin over the runner-up)``."""
+        probabilities = self.probabilities(text)
+        ranked = sorted(range(len(self.labels)), key=probabilities.__getitem__, reverse=True)
+        best, second = ranked[0], ranked[1]
+        return (
+            self.labels[best],
+            probabilities[best],
+            probabilities[best] - probabilities[second],
+        )
+
+    def fit(
+        self,
+        examples: list[tuple[str, str]],
+        epochs: int = 8,
+        learning_rate: float = 0.5,
+        l2: float = 1e-5,
+        seed: int = 0,
+    ) -> None:
+        """Train on ``(text, label)`` pairs with plain SGD."""
+        rows = [
+            (hashed_features(text, self.buckets), self.labels.index(label))
+            for text, label in examples
+            if label in self.labels
+        ]
+        rng = random.Random(seed)
+        for epoch in range(epochs):
+            rng.shuffle(rows)
+            rate = learning_rate / (1 + epoch)
+            for features, target in rows:
+                scores = list(self.bias)
+                for label in range(len(self.labels)):
+                    offset = label * self.buckets
+                    scores[label] += sum(
+                        self.weights[offset + bucket] * value
+                        for bucket, value in features.items()
+                    )
+                probabilities = _softmax(scores)
+                for label, probability in enumerate(probabilities):
+                    gradient = probability - (label == target)
+                    self.bias[label] -= rate * gradient
+                    offset = label * self.buckets
+                    for bucket, value in features.items():
+                        index = offset + bucket
+                        self.weights[index] -= rate * (
+                            gradient * value + l2 * self.weights[index]
+                        )
+
+    def save(self, path: str = MODEL_FILE) -> None:
+        payload = {
+            "buckets": self.buckets,
+            "labels": list(self.labels),
+            "bias": self.bias,
+            "weights": base64.b64encode(self.weights.tobytes()).decode("ascii"),
+        }
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+    @classmethod
+    def load(cls, path: str = MODEL_FILE) -> "HashedLinearModel":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        model = cls(payload["buckets"], payload["labels"])
+        model.bias = [float(value) for value in payload["bias"]]
+        model.weights = array("f")
+        model.weights.frombytes(base64.b64decode(payload["weights"]))
+        expected = model.buckets * len(model.labels)
+        if len(model.weights) != expected:
+            raise ValueError(f"{path} has {len(model.weights)} weights, expected {expected}")
+        return model
+
+
+_model: HashedLinearModel | None = None
+_model_loaded = False
+_model_lock = threading.Lock()
+
+
+def linear_model() -> HashedLinearModel | None:
+    """The shipped model, or None when it is disabled or not trained yet."""
+    global _model, _model_loaded
+    if not linear_tier_enabled():
+        return None
+    with _model_lock:
+        if not _model_loaded:
+            _model_loaded = True
+            if os.path.exists(MODEL_FILE):
+                try:
+                    _model = HashedLinearModel.load(MODEL_FILE)
+                except Exception as e:
+                    print(f"⚠️ Linear sentiment model unavailable: {e}")
+        return _model
+
+
+def linear_version() -> str:
+    """Checksum of the loaded model and threshold, or ``"none"`` without one."""
+    model = linear_model()
+    if model is None:
+        return "none"
+    checksum = zlib.crc32(model.weights.tobytes(), zlib.crc32(repr(model.bias).encode()))
+    return f"{checksum:08x}@{margin_threshold()}"
+
+
+def linear_decision(lower_text: str) -> dict | None:
+    """Result of the linear tier when its margin clears the threshold."""
+    model = linear_model()
+    if model is None:
+        return None
+    label, probability, margin = model.predict(lower_text)
+    if margin < margin_threshold():
+        return None
+    return {"final_sentiment": label, "score": probability, "method": "linear_model"}
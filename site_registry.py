@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from lxml import etree
+
+from transports import DEFAULT_TRANSPORTS, TRANSPORTS
+
+SITES_FILE = "news_sites.json"
+
+
+@lru_cache(maxsize=None)
+def compiled_xpath(expression: str) -> etree.XPath:
+    """Compile an XPath once per process; later calls reuse the evaluator."""
+    return etree.XPath(expression)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    per_second: float = 1.0
+    burst: int = 1
+
+
+@dataclass(frozen=True)
+class SiteConfig:
+    name: str
+    base_url: str
+    headline_xpath: str
+    link_xpath: str
+    dynamic: bool = False
+    rss_url: str | None = None
+    rate_limit: RateLimit = field(default_factory=RateLimit)
+    transports: tuple[str, ...] = DEFAULT_TRANSPORTS
+
+    @property
+    def listing_url(self) -> str:
+        return self.rss_url or self.base_url
+
+
+def _require_url(name: str, key: str, value) -> str:
+    if not isinstance(value, str) or not value.startswith(("http://", "https://")):
+        raise ValueError(f"{SITES_FILE}: {name}.{key} must be an http(s) URL, got {value!r}")
+    return value
+
+
+def _require_xpath(name: str, key: str, value) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{SITES_FILE}: {name}.{key} must be a non-empty XPath")
+    try:
+        compiled_xpath(value)
+    except etree.XPathSyntaxError as e:
+        raise ValueError(f"{SITES_FILE}: {name}.{key} is not valid XPath: {e}") from e
+    return value
+
+
+def parse_site(name: str, raw: dict) -> SiteConfig:
+    """Validate one ``news_sites.json`` entry and compile its selectors."""
+    if not isinstance(raw, dict):
+        raise ValueError(f"{SITES_FILE}: {name} must be an object")
+    unknown = set(raw) - {
+        "base_url",
+        "rss_url",
+        "headline_xpath",
+        "link_xpath",
+        "dynamic",
+        "rate_limit",
+        "transports",
+    }
+    if unknown:
+        raise ValueError(f"{SITES_FILE}: {name} has unknown keys {sorted(unknown)}")
+    dynamic = raw.get("dynamic", False)
+    if not isinstance(dynamic, bool):
+        raise ValueError(f"{SITES_FILE}: {name}.dynamic must be true or false")
+
+    limit = raw.get("rate_limit") or {}
+    try:
+        rate_limit = RateLimit(
+            per_second=float(limit.get("per_second", RateLimit.per_second)),
+            burst=int(limit.get("burst", RateLimit.burst)),
+        )
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ValueError(f"{SITES_FILE}: {name}.rate_limit is invalid: {e}") from e
+    if rate_limit.per_second < 0 or rate_limit.burst < 1:
+        raise ValueError(f"{SITES_FILE}: {name}.rate_limit is out of range")
+
+    transports = raw.get("transports", list(DEFAULT_TRANSPORTS))
+    if (
+        not isinstance(transports, list)
+        or not transports
+        or any(transport not in TRANSPORTS for transport in transports)
+    ):
+        raise ValueError(
+            f"{SITES_FILE}: {name}.transports must list some of {list(TRANSPORTS)}"
+        )
+
+    return SiteConfig(
+        name=name,
+        base_url=_require_url(name, "base_url", raw.get("base_url")),
+        rss_url=(
+            _require_url(name, "rss_url", raw["rss_url"]) if raw.get("rss_url") else None
+        ),
+        headline_xpath=_require_xpath(name, "headline_xpath", raw.get("headline_xpath")),
+        link_xpath=_require_xpath(name, "link_xpath", raw.get("link_xpath")),
+        dynamic=dynamic,
+        rate_limit=rate_limit,
+        transports=tuple(transports),
+    )
+
+
+def load_sites(path: str = SITES_FILE) -> dict[str, SiteConfig]:
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    return {name: parse_site(name, entry) for name, entry in raw.items()}
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import datetime
+import math
+import os
+import threading
+from collections import Counter
+
+from cache_store import load_json, save_json
+
+STATS_FILE = "site_stats.json"
+# Weight of the newest run in the moving averages.
+SMOOTHING = 0.3
+# Counters kept per run by process_site.
+FIELDS = ("listed", "attempts", "junk", "fetch_failures", "accepted", "seconds")
+# A site is treated as dead after this many attempted runs whose accepted
+# average stays below DEAD_SITE_ACCEPTED (an EMA that has decayed to ~zero).
+DEAD_SITE_RUNS = 3
+DEAD_SITE_ACCEPTED = 0.05
+
+
+def adaptive_budgets_enabled() -> bool:
+    return os.getenv("NEWS_ADAPTIVE_BUDGETS", "1").lower() not in {"0", "false", "no"}
+
+
+class SiteStats:
+    """Per-site yield history, used to size and order the next run.
+
+    Each finished site updates an exponential moving average of its
+    counters; ``save()`` persists them once the run completes.
+    """
+
+    def __init__(self, name: str = STATS_FILE):
+        self.name = name
+        self.history: dict[str, dict] | None = None
+        self.lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict]:
+        if self.history is None:
+            self.history = load_json(self.name, {})
+        return self.history
+
+    def get(self, site: str) -> dict | None:
+        with self.lock:
+            return self._load().get(site)
+
+    def record(self, site: str, run: Counter) -> None:
+        # A run with no attempts (listing failure, every URL already known)
+        # says nothing about yield and would only drag the averages down.
+        if not run["attempts"]:
+            return
+        with self.lock:
+            entry = self._load().get(site)
+            if entry is None:
+                entry = {field: float(run[field]) for field in FIELDS}
+                entry["runs"] = 0
+            else:
+                for field in FIELDS:
+                    entry[field] = (
+                        (1 - SMOOTHING) * entry.get(field, 0.0)
+                        + SMOOTHING * run[field]
+                    )
+            entry["runs"] += 1
+            entry["updated"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            self.history[site] = entry
+
+    def save(self) -> None:
+        with self.lock:
+            if self.history:
+                save_json(self.name, self.history)
+
+    def attempt_budget(self, site: str, base: int, max_articles: int) -> int:
+        """Attempts needed to reach ``max_articles`` at the site's usual yield.
+
+        Falls back to ``base`` without history or when articles are
+        unlimited. The result stays between ``max_articles`` and three
+        times ``base``. Only a site that has accepted nothing over
+        ``DEAD_SITE_RUNS`` attempted runs drops to ``max_articles``;
+        low-yield sites are sized from their smoothed rate instead.
+        """
+        entry = self.get(site)
+        if not adaptive_budgets_enabled() or not entry or not base or not max_articles:
+            return base
+        if entry["runs"] >= DEAD_SITE_RUNS and entry["accepted"] < DEAD_SITE_ACCEPTED:
+            return max_articles
+        # Laplace smoothing keeps a single lucky run from collapsing the budget.
+        rate = (entry["accepted"] + 1) / (entry["attempts"] + 2)
+        budget = math.ceil(max_articles / rate * 1.5)
+        return max(max_articles, min(budget, base * 3))
+
+    def priority(self, site: str) -> float:
+        """Accepted articles per second; unmeasured sites go first."""
+        entry = self.get(site)
+        if not entry:
+            return math.inf
+        return entry["accepted"] / max(entry["seconds"], 1.0)
+
+    def order(self, sites: list) -> list:
+        """``(site, cfg)`` pairs sorted so productive sites start first."""
+        if not adaptive_budgets_enabled():
+            return list(sites)
+        return sorted(sites, key=lambda pair: -self.priority(pair[0]))
+
+
+site_stats = SiteStats()
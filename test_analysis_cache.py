@@ -0,0 +1,103 @@
+import datetime
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import feed_data
+import keyword_extractor
+import political_bias
+from analysis_cache import AnalysisCache, analyzer_versions, stale_analysis_query
+
+
+class AnalysisCacheTests(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch("cache_store.CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = AnalysisCache()
+        self.addCleanup(self.cache.close)
+
+    def test_only_unseen_texts_are_computed(self):
+        compute = Mock(side_effect=lambda texts: [{"length": len(text)} for text in texts])
+
+        first = self.cache.map("sentiment", "1", ["a  b", "ccc"], compute)
+        # Whitespace is normalized, so "a b" is the same input as "a  b".
+        second = self.cache.map("sentiment", "1", ["a b", "ccc", "dddd"], compute)
+        self.cache.map("sentiment", "2", ["ccc"], compute)
+
+        self.assertEqual(first, [{"length": 4}, {"length": 3}])
+        self.assertEqual(second, [{"length": 4}, {"length": 3}, {"length": 4}])
+        self.assertEqual(
+            [call.args[0] for call in compute.call_args_list],
+            [["a  b", "ccc"], ["dddd"], ["ccc"]],
+        )
+        self.assertEqual(self.cache.stats()["sentiment_hits"], 2)
+
+    def test_rejected_results_are_not_stored(self):
+        self.cache.map(
+            "sentiment", "1", ["text"], lambda texts: [{}], keep=lambda result: bool(result)
+        )
+
+        self.assertIsNone(self.cache.get("sentiment", "1", "text"))
+
+    def test_close_prunes_rows_unused_for_the_retention_window(self):
+        self.cache.put("entities", "1", "old", ["A"])
+        self.cache.put("entities", "1", "new", ["B"])
+        long_ago = (datetime.date.today() - datetime.timedelta(days=90)).isoformat()
+        with self.cache.connection:
+            self.cache.connection.execute("UPDATE analysis SET used = ?", (long_ago,))
+        self.cache.get("entities", "1", "new")
+
+        self.cache.close()
+
+        self.assertIsNone(self.cache.get("entities", "1", "old"))
+        self.assertEqual(self.cache.get("entities", "1", "new"), ["B"])
+
+
+class AnalyzerVersionTests(unittest.TestCase):
+    def test_fingerprints_follow_the_rule_tables(self):
+        cases = (
+            (
+                feed_data,
+                "NEGATIVE_KEYWORDS",
+                feed_data.NEGATIVE_KEYWORDS + ["drought"],
+                feed_data.keyword_fingerprint,
+            ),
+            (
+                political_bias,
+                "LEFT_FRAMING",
+                {**political_bias.LEFT_FRAMING, "new deal": 1.0},
+                political_bias.bias_rules_fingerprint,
+            ),
+            (
+                keyword_extractor,
+                "STOPWORDS",
+                keyword_extractor.STOPWORDS | {"week"},
+                keyword_extractor.entity_rules_fingerprint,
+            ),
+        )
+        for module, name, edited, fingerprint in cases:
+            with self.subTest(table=name):
+                before = fingerprint()
+                with patch.object(module, name, edited):
+                    self.assertNotEqual(fingerprint(), before)
+                self.assertEqual(fingerprint(), before)
+
+    def test_bias_stamp_follows_the_method_that_produced_it(self):
+        rules = analyzer_versions("full_article_framing_v2")
+        gemini = analyzer_versions("gemini_flash_full_article_v1")
+
+        self.assertEqual(rules["bias"], political_bias.rule_bias_version())
+        self.assertEqual(gemini["bias"], political_bias.gemini_bias_version())
+        for analyzer in ("cleaner", "sentiment", "entities"):
+            self.assertEqual(rules[analyzer], gemini[analyzer])
+        bias_clause = stale_analysis_query(rules)["$or"][-1]
+        self.assertEqual(
+            bias_clause["bias_method"], {"$not": {"$regex": "^(?:gemini_|full_article_)"}}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
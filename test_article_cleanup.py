@@ -1,6 +1,11 @@
 import unittest
 
-from article_quality import clean_article_text, clean_headline, repair_joined_quotes
+from article_quality import (
+    classify_junk,
+    clean_article_text,
+    clean_headline,
+    repair_joined_quotes,
+)
 from keyword_extractor import is_boilerplate_entity, is_roman_numeral, normalize_entity
 
 
@@ -50,6 +55,67 @@ class ArticleCleanupTests(unittest.TestCase):
             "He's sure reporters' homes were searched.",
         )
 
+    def test_compiled_cleaner_matches_legacy_output(self):
+        from bench_text_cleaning import load_corpus, mismatches
+
+        headlines, texts = load_corpus()
+        texts += [
+            "Advertisement Save share Listen to this article  U. S. officials said.",
+            "this video can save share not be played\tE.g.Word Q.",
+            "Analysisby Jane Doe Who'came alive'in 5 min read",
+        ]
+        self.assertEqual(mismatches(headlines + texts, texts), [])
+
+    def test_cleaning_is_memoized_per_rules_version(self):
+        from unittest.mock import patch
+
+        import article_quality
+
+        headline = "Council approves  the transit budget after a long debate"
+        clean_headline(headline)
+        before = article_quality.cleaning_cache_stats()["clean_headline"]
+        clean_headline(headline)
+        after = article_quality.cleaning_cache_stats()["clean_headline"]
+        self.assertEqual(after["hits"], before["hits"] + 1)
+
+        with patch.object(article_quality, "RULES_VERSION", "changed-rules"):
+            clean_headline(headline)
+        self.assertEqual(
+            article_quality.cleaning_cache_stats()["clean_headline"]["misses"],
+            after["misses"] + 1,
+        )
+
+    def test_long_article_bodies_are_not_memoized(self):
+        import article_quality
+
+        body = "The council met on Tuesday. " * (article_quality.TEXT_CACHE_MAX_CHARS // 10)
+        before = article_quality.cleaning_cache_stats()["clean_article_text"]
+        self.assertEqual(clean_article_text(body), clean_article_text(body))
+        after = article_quality.cleaning_cache_stats()["clean_article_text"]
+        self.assertEqual(after["uncached"], before["uncached"] + 2)
+        self.assertEqual(after["size"], before["size"])
+
+    def test_junk_classification_names_the_rule(self):
+        self.assertEqual(classify_junk("Too short"), "SHORT_HEADLINE")
+        self.assertTrue(
+            classify_junk("Play today's Mini Crossword puzzle").startswith("JUNK_PATTERNS:")
+        )
+        self.assertTrue(
+            classify_junk(
+                "Council approves the transit budget", "https://video.example.com/video/1"
+            ).startswith("URL_PATH:")
+        )
+        # The host is not part of the path.
+        self.assertIsNone(
+            classify_junk("Council approves the transit budget", "https://video.example.com/news/1")
+        )
+        self.assertEqual(
+            classify_junk(
+                "Council approves the transit budget", "", "Sign up for our email updates."
+            ),
+            "JUNK_FRAGMENTS: sign up for our email",
+        )
+
     def test_rejects_standalone_roman_numerals(self):
         self.assertTrue(is_roman_numeral("III"))
         self.assertFalse(is_roman_numeral("PWHL"))
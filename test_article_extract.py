@@ -0,0 +1,68 @@
+import unittest
+
+from lxml import html
+
+from article_extract import extract_article
+
+ARTICLE_PARAGRAPHS = (
+    "//article//p//text() | "
+    "//div[contains(@class, 'article__content')]//p//text()"
+)
+
+
+def tree_extract(content):
+    """The DOM-based extraction that ArticleTarget replaces."""
+    tree = html.fromstring(content)
+    paras = tree.xpath(ARTICLE_PARAGRAPHS) or tree.xpath("//p//text()")
+    image = None
+    for expression in (
+        "//meta[@property='og:image']/@content",
+        "//meta[@name='twitter:image']/@content",
+    ):
+        found = tree.xpath(expression)
+        if found:
+            image = found[0]
+            break
+    else:
+        for src in tree.xpath("//article//img/@src") + tree.xpath("//img/@src"):
+            if src.startswith("http"):
+                image = src
+                break
+    return " ".join(paras).strip(), image
+
+
+PAGES = [
+    b"""<html><head><meta name="twitter:image" content="https://img/t.jpg">
+    <meta property="og:image" content="https://img/og.jpg"></head>
+    <body><nav><p>Menu</p></nav><article><h1>Title</h1>
+    <p>First <b>bold</b> and <a href="/x">linked</a> text.</p>
+    <figure><img src="/rel.jpg"><img src="https://img/a.jpg"></figure>
+    <p>Second &amp; final paragraph.<!-- note --> More</p></article>
+    <p>Footer paragraph</p><script>var p = "<p>";</script></body></html>""",
+    b"""<html><body><div class="story article__content-body">
+    <p>Unclosed paragraph one<p>Unclosed two</div>
+    <img src="https://img/page.jpg"><p>Outside</p></body></html>""",
+    b"""<html><head><meta property="og:image"></head><body>
+    <p>Only page <i>level <u>nested</u></i> text</p><p></p>
+    <img src="https://img/late.jpg"></body></html>""",
+    """<html><head><meta charset="iso-8859-1"></head><body><article>
+    <p>Caf\xe9 cr\xe8me</p></article></body></html>""".encode("latin-1"),
+]
+
+
+class ArticleExtractTests(unittest.TestCase):
+    def test_matches_dom_based_extraction(self):
+        for page in PAGES:
+            with self.subTest(page=page[:60]):
+                self.assertEqual(extract_article(page), tree_extract(page))
+
+    def test_article_paragraphs_win_over_page_paragraphs(self):
+        text, image = extract_article(PAGES[0])
+
+        self.assertNotIn("Footer", text)
+        self.assertNotIn("Menu", text)
+        self.assertEqual(image, "https://img/og.jpg")
+
+
+if __name__ == "__main__":
+    unittest.main()
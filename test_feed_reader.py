@@ -0,0 +1,66 @@
+import datetime
+import unittest
+
+from feed_reader import iter_feed_items, parse_published
+
+RSS_ITEM = """
+<item>
+  <title>Story {n}</title>
+  <link>https://example.com/story-{n}</link>
+  <description>Summary {n}</description>
+  <pubDate>Mon, 12 Oct 2026 {n:02d}:00:00 GMT</pubDate>
+</item>"""
+
+
+def rss_chunks(hours, size=64):
+    body = (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+        + "".join(RSS_ITEM.format(n=n) for n in hours)
+        + "</channel></rss>"
+    ).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class FeedReaderTests(unittest.TestCase):
+    def test_reading_stops_after_the_previous_high_water_mark(self):
+        chunks = rss_chunks([20, 19, 18, 17, 16, 15, 14, 13, 12, 11, 10])
+        consumed = []
+
+        def tracked():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        since = parse_published("Mon, 12 Oct 2026 18:00:00 GMT")
+        items = list(iter_feed_items(tracked(), since))
+
+        self.assertEqual(
+            [item["link"] for item in items],
+            ["https://example.com/story-20", "https://example.com/story-19"],
+        )
+        self.assertLess(len(consumed), len(chunks))
+
+    def test_atom_entries_are_read(self):
+        body = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <title>Atom story</title>
+    <link rel="alternate" href="https://example.com/atom-story"/>
+    <summary>Atom summary</summary>
+    <updated>2026-10-12T08:30:00Z</updated>
+  </entry>
+</feed>"""
+
+        [item] = list(iter_feed_items([body]))
+
+        self.assertEqual(item["title"], "Atom story")
+        self.assertEqual(item["link"], "https://example.com/atom-story")
+        self.assertEqual(item["summary"], "Atom summary")
+        self.assertEqual(
+            item["published"],
+            datetime.datetime(2026, 10, 12, 8, 30, tzinfo=datetime.timezone.utc),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
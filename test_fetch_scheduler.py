@@ -0,0 +1,61 @@
+import time
+import unittest
+from concurrent.futures import wait
+
+from fetch_scheduler import FetchScheduler, host_key
+from site_registry import parse_site
+
+
+class FetchSchedulerTests(unittest.TestCase):
+    def test_results_keep_input_order(self):
+        scheduler = FetchScheduler(lambda url: (url, None), max_in_flight=3)
+        scheduler.configure("example.com", 0)
+        urls = [f"https://example.com/{index}" for index in range(7)]
+
+        self.assertEqual(
+            [text for text, _image in scheduler.iter_results(urls)], urls
+        )
+        scheduler.shutdown()
+
+    def test_subdomains_share_the_configured_site_bucket(self):
+        scheduler = FetchScheduler(lambda url: url, max_in_flight=1)
+        cnn = parse_site(
+            "cnn",
+            {
+                "base_url": "https://www.cnn.com/",
+                "headline_xpath": "//a",
+                "link_xpath": "./@href",
+                "rate_limit": {"per_second": 0.5},
+            },
+        )
+        scheduler.configure_sites({"cnn": cnn})
+
+        bucket = scheduler.bucket_for("https://edition.cnn.com/2026/story")
+        self.assertIs(bucket, scheduler.bucket_for("https://www.cnn.com/other"))
+        self.assertEqual(bucket.rate, 0.5)
+        self.assertEqual(host_key("https://www.bbc.com/news"), "bbc.com")
+        scheduler.shutdown()
+
+    def test_slow_host_does_not_hold_workers_from_a_fast_host(self):
+        scheduler = FetchScheduler(lambda url: url, max_in_flight=2)
+        scheduler.configure("slow.example", 0.2)
+        scheduler.configure("fast.example", 0)
+        started = time.monotonic()
+
+        # The slow host's second and third tokens are 5s and 10s away.
+        slow = [scheduler.submit(f"https://slow.example/{index}") for index in range(3)]
+        fast = [scheduler.submit(f"https://fast.example/{index}") for index in range(4)]
+        done, _pending = wait(fast, timeout=2)
+
+        self.assertEqual(len(done), 4)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(slow[0].result(timeout=1), "https://slow.example/0")
+        self.assertFalse(slow[1].done() or slow[2].done())
+        scheduler.shutdown()
+        wait(slow[1:], timeout=1)
+        self.assertTrue(all(future.cancelled() for future in slow[1:]))
+        self.assertFalse(scheduler.dispatcher.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
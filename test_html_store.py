@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import cache_store
+import html_store
+import sentiment_analysis_pipeline as pipeline
+from html_store import HtmlStore
+
+
+class HtmlStoreWriterTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        for module in (cache_store, html_store):
+            patcher = patch.object(module, "CACHE_DIR", directory.name)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.root = directory.name
+
+    def stored_files(self):
+        return sorted(
+            name for _directory, _subdirs, files in os.walk(self.root) for name in files
+        )
+
+    def test_streamed_chunks_round_trip(self):
+        store = HtmlStore()
+        with store.writer("https://example.com/a") as page:
+            for chunk in (b"<html><body>", b"<p>Hello</p>", b"</body></html>"):
+                page.write(chunk)
+
+        self.assertEqual(
+            store.get("https://example.com/a"),
+            b"<html><body><p>Hello</p></body></html>",
+        )
+        self.assertGreater(store.total_bytes, 0)
+
+    def test_rejected_download_leaves_nothing_behind(self):
+        store = HtmlStore()
+        with self.assertRaises(ValueError):
+            with store.writer("https://example.com/a") as page:
+                page.write(b"<html>")
+                raise ValueError("body exceeds the cap")
+
+        self.assertIsNone(store.get("https://example.com/a"))
+        self.assertEqual(self.stored_files(), [])
+
+    @patch.dict(os.environ, {"NEWS_HTML_CACHE": "0"})
+    def test_disabled_store_writes_nothing(self):
+        with HtmlStore().writer("https://example.com/a") as page:
+            page.write(b"<html></html>")
+
+        self.assertEqual(self.stored_files(), [])
+
+    def test_page_is_stored_only_after_a_successful_parse(self):
+        store = HtmlStore()
+        parser = Mock()
+        parser.close.side_effect = [ValueError("broken markup"), ("Body text.", None)]
+        chunks = [b"<html><body>", b"<p>Body text.</p></body></html>"]
+
+        with patch.object(pipeline, "html_store", store), patch.object(
+            pipeline, "article_parser", return_value=parser
+        ):
+            with self.assertRaises(ValueError):
+                pipeline.parse_article_chunks("https://example.com/a", chunks, "text/html")
+            self.assertEqual(self.stored_files(), [])
+
+            pipeline.parse_article_chunks("https://example.com/a", chunks, "text/html")
+
+        self.assertEqual(store.get("https://example.com/a"), b"".join(chunks))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import http_cache
+
+
+def listing_response(status, headers=None, content=b""):
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.content = content
+    return response
+
+
+class ConditionalGetTests(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch("cache_store.CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = http_cache.ValidatorCache()
+        patcher = patch.object(http_cache, "validator_cache", self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("http_cache.get_session")
+    def test_not_modified_listing_reuses_parsed_results(self, get_session):
+        url = "https://www.example.com/"
+        key = http_cache.cache_key(url, "//h2")
+        articles = [{"headline": "A complete headline here", "link": url + "story"}]
+        self.cache.store(key, url, listing_response(200, {"ETag": '"v1"'}), articles)
+        self.cache.commit()
+        get_session.return_value.get.return_value = listing_response(304)
+
+        _response, cached = http_cache.conditional_get(url, key, {"User-Agent": "test"})
+
+        sent = get_session.return_value.get.call_args.kwargs["headers"]
+        self.assertEqual(sent["If-None-Match"], '"v1"')
+        self.assertEqual(cached, articles)
+        self.assertTrue(self.cache.is_unchanged(url))
+
+    @patch("http_cache.get_session")
+    def test_responses_without_validators_are_not_cached(self, get_session):
+        url = "https://www.example.com/"
+        key = http_cache.cache_key(url)
+        self.cache.store(key, url, listing_response(200), [{"headline": "x"}])
+        get_session.return_value.get.return_value = listing_response(200)
+
+        _response, cached = http_cache.conditional_get(url, key, {})
+
+        self.assertIsNone(cached)
+        self.assertNotIn("If-None-Match", get_session.return_value.get.call_args.kwargs["headers"])
+
+    @patch("http_cache.get_session")
+    def test_validators_wait_for_commit_and_discard_drops_them(self, get_session):
+        url = "https://www.example.com/"
+        key = http_cache.cache_key(url)
+        response = listing_response(200, {"ETag": '"v1"'})
+        get_session.return_value.get.return_value = listing_response(200)
+
+        self.cache.store(key, url, response, [{"headline": "x"}])
+        http_cache.conditional_get(url, key, {})
+        self.assertNotIn("If-None-Match", get_session.return_value.get.call_args.kwargs["headers"])
+
+        # A truncated site run leaves no validators behind.
+        self.cache.discard(url)
+        self.cache.commit()
+        self.assertEqual(http_cache.ValidatorCache().request_headers(key), {})
+
+        self.cache.store(key, url, response, [{"headline": "x"}])
+        self.cache.commit()
+        self.assertEqual(http_cache.ValidatorCache().request_headers(key), {"If-None-Match": '"v1"'})
+
+
+if __name__ == "__main__":
+    unittest.main()
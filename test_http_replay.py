@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests.adapters import BaseAdapter
+
+import http_replay
+
+
+class CannedAdapter(BaseAdapter):
+    """Stands in for the network while recording."""
+
+    def __init__(self, body):
+        super().__init__()
+        self.body = body
+        self.sent = 0
+
+    def send(self, request, **kwargs):
+        self.sent += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/html"
+        response._content = self.body + (request.body or b"")
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class RecordReplayTests(unittest.TestCase):
+    def setUp(self):
+        fixtures = tempfile.TemporaryDirectory()
+        self.addCleanup(fixtures.cleanup)
+        patcher = patch.dict(os.environ, {"NEWS_HTTP_FIXTURES": fixtures.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def session(self, mode):
+        with patch.dict(os.environ, {"NEWS_HTTP_REPLAY": mode}):
+            return http_replay.prepare_session(requests.Session())
+
+    def test_recorded_responses_replay_without_the_network(self):
+        recorder = self.session("record")
+        network = CannedAdapter(b"<p>story</p>")
+        recorder.mount("https://", network)
+        recorder.get("https://example.com/a", headers={"x-goog-api-key": "secret"})
+        recorder.post("https://example.com/api", json={"prompt": "one"})
+
+        replayer = self.session("replay")
+        page = replayer.get("https://example.com/a", stream=True)
+        api = replayer.post("https://example.com/api", json={"prompt": "one"})
+
+        self.assertEqual(network.sent, 2)
+        self.assertEqual(b"".join(page.iter_content(4)), b"<p>story</p>")
+        self.assertEqual(page.headers["Content-Type"], "text/html")
+        self.assertEqual(api.content, b'<p>story</p>{"prompt": "one"}')
+        with self.assertRaises(requests.ConnectionError):
+            replayer.post("https://example.com/api", json={"prompt": "two"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import os
+import unittest
+from unittest.mock import Mock, patch
+
+import onnx_backend
+
+
+class OnnxBackendSelectionTests(unittest.TestCase):
+    @patch.dict(os.environ, {"NEWS_INFERENCE_BACKEND": ""})
+    def test_torch_is_the_default_backend(self):
+        loader = Mock()
+        with patch.dict(onnx_backend.PIPELINES, {"sentiment-analysis": loader}):
+            self.assertIsNone(onnx_backend.onnx_pipeline("sentiment-analysis", "model"))
+        loader.assert_not_called()
+
+    @patch.dict(os.environ, {"NEWS_INFERENCE_BACKEND": "onnx"})
+    def test_failed_onnx_load_falls_back_to_torch(self):
+        loader = Mock(side_effect=ImportError("No module named 'optimum'"))
+        with patch.dict(onnx_backend.PIPELINES, {"sentiment-analysis": loader}), patch(
+            "builtins.print"
+        ) as printed:
+            self.assertIsNone(onnx_backend.onnx_pipeline("sentiment-analysis", "model"))
+        loader.assert_called_once_with("model")
+        self.assertIn("using PyTorch", printed.call_args.args[0])
+
+    @patch.dict(os.environ, {"NEWS_SENTIMENT_FAST": "0", "NEWS_PIPELINE_FAST": "0"})
+    def test_backend_is_part_of_the_sentiment_version(self):
+        from feed_data import sentiment_version
+
+        with patch.dict(os.environ, {"NEWS_INFERENCE_BACKEND": "torch"}):
+            torch_version = sentiment_version()
+        with patch.dict(os.environ, {"NEWS_INFERENCE_BACKEND": "onnx"}):
+            onnx_version = sentiment_version()
+        self.assertNotEqual(torch_version, onnx_version)
+        self.assertIn("@onnx", onnx_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -87,8 +87,9 @@ class PoliticalBiasTests(unittest.TestCase):
             "NEWS_BIAS_FAST": "",
         },
     )
-    @patch("political_bias.requests.post")
-    def test_gemini_structured_result_is_normalized(self, post):
+    @patch("political_bias.get_session")
+    def test_gemini_structured_result_is_normalized(self, get_session):
+        post = get_session.return_value.post
         response = Mock()
         response.raise_for_status.return_value = None
         response.json.return_value = {
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import feed_data
+import sentiment_linear
+from sentiment_linear import HashedLinearModel
+
+EXAMPLES = [
+    ("volunteers celebrate as the new library opens to cheers", "positive"),
+    ("the team wins the championship after a brilliant season", "positive"),
+    ("the council publishes its meeting schedule for tuesday", "neutral"),
+    ("the committee lists the members of its review panel", "neutral"),
+    ("floods destroy homes and leave families stranded", "negative"),
+    ("the company warns of heavy losses and job cuts", "negative"),
+]
+
+
+def trained_model() -> HashedLinearModel:
+    model = HashedLinearModel(buckets=1024)
+    model.fit(EXAMPLES * 20)
+    return model
+
+
+class LinearTierTests(unittest.TestCase):
+    def test_saved_model_predicts_the_same(self):
+        model = trained_model()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "model.json.gz")
+            model.save(path)
+            loaded = HashedLinearModel.load(path)
+
+        for text, label in EXAMPLES:
+            with self.subTest(text=text):
+                self.assertEqual(loaded.predict(text)[0], label)
+                self.assertAlmostEqual(loaded.predict(text)[1], model.predict(text)[1], places=6)
+
+    @patch.dict(
+        os.environ,
+        {"NEWS_SENTIMENT_FAST": "", "NEWS_PIPELINE_FAST": "", "NEWS_SENTIMENT_MARGIN": "0.5"},
+    )
+    def test_only_low_margin_articles_reach_the_transformer(self):
+        transformer = Mock(return_value=[{"label": "neutral", "score": 0.6}])
+        items = [
+            ("Volunteers celebrate as the new library opens to cheers", ""),
+            ("Gardeners swap tomato seeds", ""),
+        ]
+
+        with patch.object(sentiment_linear, "linear_model", return_value=trained_model()), patch.object(
+            feed_data, "_sentiment_model", return_value=transformer
+        ):
+            results = feed_data.analyze_keywords_batch(items)
+
+        self.assertEqual(transformer.call_args.args[0], ["Gardeners swap tomato seeds."])
+        self.assertEqual(results[0]["method"], "linear_model")
+        self.assertEqual(results[0]["final_sentiment"], "positive")
+        self.assertGreater(results[0]["score"], 0.5)
+        self.assertEqual(results[1]["method"], "model")
+
+
+if __name__ == "__main__":
+    unittest.main()
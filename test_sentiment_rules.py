@@ -0,0 +1,119 @@
+import json
+import os
+import re
+import unittest
+from unittest.mock import Mock, patch
+
+import feed_data
+from feed_data import (
+    MIXED_KEYWORDS,
+    NEGATIVE_KEYWORDS,
+    NEUTRAL_INDICATORS,
+    POSITIVE_KEYWORDS,
+    STRONG_NEGATIVE_KEYWORDS,
+    analyze_keywords,
+    analyze_keywords_batch,
+)
+
+
+def legacy_rule_decision(text, context=""):
+    """analyze_keywords' rule tier as it was before KeywordAutomaton."""
+    lower_text = f"{text}. {context}".strip().lower()
+    has_negative = any(word in lower_text for word in NEGATIVE_KEYWORDS)
+    has_positive = any(word in lower_text for word in POSITIVE_KEYWORDS)
+    has_mixed = any(w in lower_text for w in MIXED_KEYWORDS)
+    has_neutral = any(w in lower_text for w in NEUTRAL_INDICATORS)
+    has_strong_negative = any(
+        re.search(rf"(?<!\w){re.escape(phrase)}(?!\w)", lower_text)
+        for phrase in STRONG_NEGATIVE_KEYWORDS
+    )
+    if has_strong_negative:
+        return {"final_sentiment": "negative", "method": "strong_negative_rules"}
+    if has_negative and not has_positive:
+        return {"final_sentiment": "negative", "method": "negative_rules"}
+    if (has_negative and has_positive) or has_mixed:
+        return {"final_sentiment": "neutral", "method": "mixed_rules"}
+    if has_neutral and not has_negative and not has_positive:
+        return {"final_sentiment": "neutral", "method": "neutral_rules"}
+    if has_positive and not has_negative:
+        return {"final_sentiment": "positive", "method": "positive_rules"}
+    return {"final_sentiment": "neutral", "method": "fast_default"}
+
+
+class SentimentRuleParityTests(unittest.TestCase):
+    def test_keyword_tables_have_no_duplicates(self):
+        for table in (
+            NEGATIVE_KEYWORDS,
+            POSITIVE_KEYWORDS,
+            MIXED_KEYWORDS,
+            NEUTRAL_INDICATORS,
+            STRONG_NEGATIVE_KEYWORDS,
+        ):
+            self.assertEqual(len(table), len(set(table)))
+
+    @patch.dict(os.environ, {"NEWS_SENTIMENT_FAST": "1", "NEWS_SENTIMENT_LINEAR": "0"})
+    def test_decisions_match_legacy_rules_on_stored_corpus(self):
+        with open("sentiment_results.json", "r", encoding="utf-8") as f:
+            records = [record for group in json.load(f).values() for record in group]
+        cases = [(record["headline"], record["summary"]) for record in records]
+        cases += [
+            ("An award for urban design", ""),          # substrings: war, ban
+            ("Warfare returns to the region", ""),      # strong "war" needs a boundary
+            ("Storm kills two as tsunami warning issued", "Crews celebrate rescue"),
+            ("There can be no peace_talks", ""),
+            ("Officials weigh the budget plan", ""),
+        ]
+        for headline, summary in cases:
+            with self.subTest(headline=headline):
+                self.assertEqual(
+                    analyze_keywords(headline, summary),
+                    legacy_rule_decision(headline, summary),
+                )
+
+    @patch.dict(
+        os.environ,
+        {
+            "NEWS_SENTIMENT_FAST": "",
+            "NEWS_PIPELINE_FAST": "",
+            "NEWS_SENTIMENT_BATCH_SIZE": "8",
+            "NEWS_SENTIMENT_LINEAR": "0",
+        },
+    )
+    def test_only_undecided_items_reach_the_model_in_one_batch(self):
+        model = Mock(
+            return_value=[
+                {"label": "Positive", "score": 0.9},
+                {"label": "negative", "score": 0.8},
+            ]
+        )
+        items = [
+            ("Gardeners share tips for a quiet weekend", ""),
+            ("Officials weigh the budget plan", ""),
+            ("Volunteers open a library in the village", ""),
+        ]
+
+        with patch.object(feed_data, "_sentiment_model", return_value=model):
+            results = analyze_keywords_batch(items)
+
+        model.assert_called_once()
+        self.assertEqual(len(model.call_args.args[0]), 2)
+        self.assertEqual(model.call_args.kwargs, {"batch_size": 8, "truncation": True})
+        self.assertEqual(
+            [result["final_sentiment"] for result in results],
+            ["positive", "neutral", "negative"],
+        )
+        self.assertEqual(results[1]["method"], "neutral_rules")
+
+    def test_bounded_keywords_require_word_boundaries(self):
+        rules = feed_data.KeywordAutomaton(
+            {"loose": ["war"], "strict": ["war", "no peace"]}, bounded=frozenset({"strict"})
+        )
+
+        self.assertEqual(rules.scan("award"), {"loose"})
+        self.assertEqual(rules.scan("a war."), {"loose", "strict"})
+        self.assertEqual(rules.scan("no peaceful"), set())
+        self.assertEqual(rules.scan("there is no peace"), {"strict"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from site_registry import compiled_xpath, load_sites, parse_site
+
+
+class SiteRegistryTests(unittest.TestCase):
+    def test_bundled_config_loads_with_compiled_selectors(self):
+        sites = load_sites()
+
+        self.assertIn("bbc", sites)
+        self.assertEqual(sites["nytimes"].listing_url, sites["nytimes"].rss_url)
+        headline_xpath = sites["bbc"].headline_xpath
+        self.assertIs(compiled_xpath(headline_xpath), compiled_xpath(headline_xpath))
+
+    def test_invalid_xpath_fails_at_load_time(self):
+        with self.assertRaisesRegex(ValueError, r"broken\.headline_xpath"):
+            parse_site(
+                "broken",
+                {
+                    "base_url": "https://example.com/",
+                    "headline_xpath": "//a[@class=",
+                    "link_xpath": "./@href",
+                },
+            )
+
+    def test_misspelled_keys_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "unknown keys"):
+            parse_site(
+                "typo",
+                {
+                    "base_url": "https://example.com/",
+                    "headline_xpath": "//a",
+                    "link_xpath": "./@href",
+                    "dynmaic": True,
+                },
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
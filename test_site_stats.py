@@ -0,0 +1,112 @@
+import tempfile
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+import sentiment_analysis_pipeline as pipeline
+from site_registry import SiteConfig
+from site_stats import SiteStats
+
+
+class SiteStatsTests(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch("cache_store.CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stats = SiteStats()
+
+    def test_budget_follows_historical_yield(self):
+        self.stats.record("nytimes", Counter(attempts=12, accepted=10, seconds=20))
+        self.stats.record("guardian", Counter(attempts=90, accepted=5, seconds=40))
+        for _run in range(3):
+            self.stats.record("cbc", Counter(attempts=30, junk=25, accepted=0, seconds=30))
+
+        self.assertEqual(self.stats.attempt_budget("unknown", 30, 5), 30)
+        self.assertLess(self.stats.attempt_budget("nytimes", 30, 5), 30)
+        self.assertEqual(self.stats.attempt_budget("guardian", 30, 5), 90)
+        self.assertEqual(self.stats.attempt_budget("cbc", 30, 5), 5)
+        self.assertEqual(self.stats.attempt_budget("guardian", 0, 0), 0)
+
+    def test_low_yield_sites_keep_their_budget(self):
+        # About one article per 20 attempts, plus runs that attempted nothing.
+        self.stats.record("reuters", Counter(attempts=30, accepted=2, seconds=30))
+        for _run in range(5):
+            self.stats.record("reuters", Counter(listed=40, attempts=0))
+            self.stats.record("reuters", Counter(attempts=30, accepted=1, seconds=30))
+
+        self.assertEqual(self.stats.get("reuters")["runs"], 6)
+        self.assertEqual(self.stats.attempt_budget("reuters", 30, 8), 90)
+
+        # One empty run is not enough to call a site dead.
+        self.stats.record("cnn", Counter(attempts=30, accepted=0, seconds=30))
+        self.assertEqual(self.stats.attempt_budget("cnn", 30, 8), 90)
+
+    def test_productive_and_unmeasured_sites_start_first(self):
+        self.stats.record("slow", Counter(attempts=30, accepted=2, seconds=60))
+        self.stats.record("fast", Counter(attempts=10, accepted=8, seconds=10))
+        sites = [("slow", None), ("fast", None), ("new", None)]
+
+        self.assertEqual(
+            [site for site, _cfg in self.stats.order(sites)], ["new", "fast", "slow"]
+        )
+
+
+class ProcessSiteAttemptTests(unittest.TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        patcher = patch("cache_store.CACHE_DIR", cache_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.stats = SiteStats()
+        self.cfg = SiteConfig("example", "https://example.com/", "//h2", "./@href")
+        self.listing = [
+            {
+                "headline": f"Council approves transit budget number {index} after debate",
+                "link": f"https://example.com/story-{index}",
+                "content": "Article body.",
+            }
+            for index in range(200)
+        ]
+
+    def run_site(self, accept):
+        def analyze(a, head, link, fetched, run):
+            index = int(link.rsplit("-", 1)[1])
+            if not accept(index):
+                run["junk"] += 1
+                return None
+            return {"url": link}
+
+        with patch.object(pipeline, "site_stats", self.stats), patch.object(
+            pipeline, "scrape_listing", return_value=self.listing
+        ), patch.object(pipeline, "skip_unchanged_sites", return_value=False), patch.object(
+            pipeline, "analyze_candidate", side_effect=analyze
+        ), patch("builtins.print"):
+            return pipeline.process_site("example", self.cfg, 8, 30)
+
+    def test_attempts_count_only_analyzed_candidates(self):
+        self.assertEqual(len(self.run_site(lambda index: index % 2 == 0)), 8)
+        # Eight accepted among the first fifteen entries, not the 30 filtered.
+        self.assertEqual(self.stats.get("example")["attempts"], 15)
+
+    def test_budget_tracks_yield_across_runs(self):
+        budgets = {}
+        for name, accept in (
+            ("all", lambda index: True),
+            ("half", lambda index: index % 2 == 0),
+            ("tenth", lambda index: index % 10 == 0),
+        ):
+            self.stats = SiteStats(f"{name}.json")
+            for _run in range(5):
+                self.run_site(accept)
+            budgets[name] = self.stats.attempt_budget("example", 30, 8)
+
+        self.assertLess(budgets["all"], budgets["half"])
+        self.assertLess(budgets["half"], budgets["tenth"])
+        self.assertLess(budgets["all"], 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import sentiment_analysis_pipeline as pipeline
+
+
+class FakeNlp:
+    """Tags every lowercase "ottawa" as a proper noun."""
+
+    def __init__(self):
+        self.batches = []
+
+    def pipe(self, texts, batch_size, n_process):
+        texts = list(texts)
+        self.batches.append((len(texts), batch_size, n_process))
+        for text in texts:
+            yield [
+                SimpleNamespace(text=word, pos_="PROPN" if word == "ottawa" else "NOUN")
+                for word in text.split()
+            ]
+
+
+class CleanSummariesTests(unittest.TestCase):
+    @patch.dict("os.environ", {"NEWS_SPACY_BATCH_SIZE": "8", "NEWS_SPACY_PROCESSES": "2"})
+    def test_summaries_are_recased_in_one_pipe_call(self):
+        nlp = FakeNlp()
+        texts = [
+            "council members met in ottawa on monday to debate the budget",
+            "",
+            "the mayor of ottawa said the plan would cut transit delays",
+        ]
+
+        with patch.object(pipeline, "summary_nlp", return_value=nlp):
+            cleaned = pipeline.clean_summaries(texts)
+
+        self.assertEqual(nlp.batches, [(2, 8, 2)])
+        self.assertEqual(
+            cleaned,
+            [
+                "Council members met in Ottawa on monday to debate the budget.",
+                "",
+                "The mayor of Ottawa said the plan would cut transit delays.",
+            ],
+        )
+
+    def test_draft_matches_cleaning_without_a_model(self):
+        text = "officials said  the line opens at 9 am .it will cost $2bn"
+
+        with patch.object(pipeline, "summary_nlp", return_value=None):
+            self.assertEqual(pipeline.clean_summary(text), pipeline.summary_draft(text))
+
+
+class FinalizeRecordsTests(unittest.TestCase):
+    def test_entities_come_from_headline_and_summary_like_cleanup(self):
+        records = [{"headline": "Ottawa approves budget", "_summary_source": "draft"}]
+        sentiment = {"final_sentiment": "neutral", "method": "rules", "score": 0.5}
+
+        with patch.object(pipeline, "clean_summaries", return_value=["The plan passed."]), patch.object(
+            pipeline, "cached_sentiments", return_value=[sentiment]
+        ), patch.object(pipeline, "cached_entities", return_value=[["Ottawa"]]) as entities, patch(
+            "builtins.print"
+        ):
+            pipeline.finalize_records(records)
+
+        entities.assert_called_once_with(["Ottawa approves budget. The plan passed."])
+        self.assertEqual(records[0]["entities"], ["Ottawa"])
+
+
+if __name__ == "__main__":
+    unittest.main()
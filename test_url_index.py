@@ -0,0 +1,28 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from url_index import ProcessedUrlIndex, _load_file
+
+
+class ProcessedUrlIndexTests(unittest.TestCase):
+    def test_truncated_index_keeps_whole_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "processed_urls.bin")
+            index = ProcessedUrlIndex()
+            index.add("https://example.com/a")
+            index.add("https://example.com/b")
+            index.save(path)
+            with open(path, "ab") as f:
+                f.write(b"\x01\x02\x03")
+
+            with patch("builtins.print"):
+                loaded = ProcessedUrlIndex(_load_file(path))
+
+        self.assertEqual(len(loaded), 2)
+        self.assertIn("https://example.com/a#top", loaded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+"""Train the linear sentiment tier from the transformer's stored labels.
+
+    python train_sentiment_linear.py --limit 20000
+
+Reads articles whose ``sentiment_method`` is ``"model"`` from MongoDB, holds
+out 10% to report accuracy and how many articles clear the margin threshold,
+and writes ``sentiment_linear.json.gz`` next to ``feed_data.py``.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+from sentiment_linear import (
+    DEFAULT_BUCKETS,
+    MODEL_FILE,
+    HashedLinearModel,
+    margin_threshold,
+)
+
+
+def load_examples(limit: int) -> list[tuple[str, str]]:
+    load_dotenv(".env")
+    if not os.getenv("MONGO_URL"):
+        raise SystemExit("MONGO_URL is required")
+    collection = MongoClient(os.environ["MONGO_URL"])[
+        os.getenv("DB_NAME", "news_scraper")
+    ][os.getenv("COLLECTION_NAME", "articles")]
+    cursor = collection.find(
+        {"sentiment_method": "model"},
+        {"headline": 1, "summary": 1, "sentiment": 1},
+    ).sort("timestamp", -1)
+    if limit > 0:
+        cursor = cursor.limit(limit)
+    # Same text the transformer saw in analyze_keywords_batch.
+    return [
+        (f"{doc.get('headline') or ''}. {doc.get('summary') or ''}".strip().lower(), doc["sentiment"])
+        for doc in cursor
+        if doc.get("sentiment")
+    ]
+
+
+def evaluate(model: HashedLinearModel, examples, threshold: float) -> None:
+    correct = covered = covered_correct = 0
+    for text, label in examples:
+        predicted, _probability, margin = model.predict(text)
+        correct += predicted == label
+        if margin >= threshold:
+            covered += 1
+            covered_correct += predicted == label
+    total = max(len(examples), 1)
+    print(f"📊 held-out accuracy {correct / total:.1%} on {len(examples)} articles")
+    print(
+        f"📊 margin >= {threshold}: {covered / total:.1%} answered by the linear tier, "
+        f"{covered_correct / max(covered, 1):.1%} agree with the transformer"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=0, help="Newest articles to use; 0 is all")
+    parser.add_argument("--buckets", type=int, default=DEFAULT_BUCKETS)
+    parser.add_argument("--epochs", type=int, default=8)
+    parser.add_argument("--output", default=MODEL_FILE)
+    args = parser.parse_args()
+
+    examples = load_examples(args.limit)
+    if len(examples) < 100:
+        raise SystemExit(f"Only {len(examples)} transformer-labelled articles; need at least 100")
+    random.Random(0).shuffle(examples)
+    split = len(examples) // 10
+    held_out, training = examples[:split], examples[split:]
+
+    model = HashedLinearModel(args.buckets)
+    model.fit(training, epochs=args.epochs)
+    evaluate(model, held_out, margin_threshold())
+    model.save(args.output)
+    print(f"💾 Saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+
+from cache_store import load_json, save_json
+from fetch_scheduler import host_key
+from http_replay import replay_mode
+
+# Session kinds from http_sessions.get_session, all of which run in-process:
+# - cloudscraper: requests plus Cloudflare challenge solving
+# - requests: a plain pooled requests session
+# - browser_tls: curl_cffi impersonating a desktop browser's TLS handshake
+TRANSPORTS = ("cloudscraper", "requests", "browser_tls")
+DEFAULT_TRANSPORTS = ("cloudscraper",)
+STATE_FILE = "transports.json"
+
+
+def transport_available(name: str) -> bool:
+    if name == "browser_tls":
+        # curl_cffi bypasses requests adapters, so it can't be recorded.
+        if replay_mode():
+            return False
+        try:
+            import curl_cffi  # noqa: F401
+        except ImportError:
+            return False
+    return name in TRANSPORTS
+
+
+class TransportSelector:
+    """Per-host transport order, led by whichever transport last succeeded."""
+
+    def __init__(self):
+        self.configured: dict[str, tuple[str, ...]] = {}
+        self.last_success: dict[str, str] | None = None
+        self.lock = threading.Lock()
+
+    def configure_sites(self, sites: dict) -> None:
+        for cfg in sites.values():
+            for url in (cfg.base_url, cfg.rss_url):
+                if url:
+                    self.configured[host_key(url)] = cfg.transports
+
+    def _domain(self, url: str) -> str:
+        host = host_key(url)
+        for domain in sorted(self.configured, key=len, reverse=True):
+            if host == domain or host.endswith("." + domain):
+                return domain
+        return host
+
+    def order_for(self, url: str) -> list[str]:
+        domain = self._domain(url)
+        with self.lock:
+            if self.last_success is None:
+                self.last_success = load_json(STATE_FILE, {})
+            preferred = self.last_success.get(domain)
+        order = list(self.configured.get(domain, DEFAULT_TRANSPORTS))
+        if preferred in order:
+            order.remove(preferred)
+            order.insert(0, preferred)
+        return [name for name in order if transport_available(name)]
+
+    def record_success(self, url: str, name: str) -> None:
+        domain = self._domain(url)
+        with self.lock:
+            if self.last_success is None:
+                self.last_success = load_json(STATE_FILE, {})
+            if self.last_success.get(domain) == name:
+                return
+            self.last_success[domain] = name
+            save_json(STATE_FILE, self.last_success)
+
+
+transport_selector = TransportSelector()
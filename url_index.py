@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from array import array
+from bisect import bisect_left
+
+from cache_store import cache_path
+
+INDEX_FILE = "processed_urls.bin"
+
+
+def normalize_url(url: str | None) -> str:
+    return (url or "").strip().split("#", 1)[0]
+
+
+def url_hash(url: str | None) -> int:
+    digest = hashlib.blake2b(normalize_url(url).encode("utf-8"), digest_size=8)
+    return int.from_bytes(digest.digest(), "big")
+
+
+class ProcessedUrlIndex:
+    """Set of article URLs already analyzed and stored by an earlier run.
+
+    Known URLs are held as a sorted array of 64-bit hashes, about 8 bytes per
+    article, so membership is a binary search. URLs accepted during the
+    current run are kept in a plain set until ``save``.
+    """
+
+    def __init__(self, hashes=()):
+        self.hashes = array("Q", sorted(set(hashes)))
+        self.added: set[int] = set()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.hashes) + len(self.added)
+
+    def __contains__(self, url: str) -> bool:
+        value = url_hash(url)
+        position = bisect_left(self.hashes, value)
+        if position < len(self.hashes) and self.hashes[position] == value:
+            return True
+        with self.lock:
+            return value in self.added
+
+    def add(self, url: str) -> None:
+        with self.lock:
+            self.added.add(url_hash(url))
+
+    def save(self, path: str | None = None) -> None:
+        with self.lock:
+            merged = array("Q", sorted(set(self.hashes) | self.added))
+        path = path or cache_path(INDEX_FILE)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            merged.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+
+def _load_file(path: str) -> array:
+    hashes = array("Q")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return hashes
+    # A partial cache restore can cut the file mid-entry; keep whole hashes.
+    usable = len(data) - len(data) % hashes.itemsize
+    if usable != len(data):
+        print(f"⚠️ Ignoring {len(data) - usable} trailing bytes in {path}")
+    hashes.frombytes(data[:usable])
+    return hashes
+
+
+def _load_mongo_urls():
+    mongo_url = os.getenv("MONGO_URL")
+    if not mongo_url:
+        return
+    from pymongo import MongoClient
+
+    client = MongoClient(mongo_url)
+    try:
+        collection = client[
+            os.getenv("DB_NAME", "news_scraper")
+        ][os.getenv("COLLECTION_NAME", "articles")]
+        for doc in collection.find({}, {"url": 1, "_id": 0}):
+            if doc.get("url"):
+                yield url_hash(doc["url"])
+    finally:
+        client.close()
+
+
+def load_processed_urls() -> ProcessedUrlIndex:
+    """Build the index from the local cache file plus every URL in MongoDB."""
+    hashes = list(_load_file(cache_path(INDEX_FILE)))
+    try:
+        hashes.extend(_load_mongo_urls())
+    except Exception as e:
+        print(f"⚠️ Could not load processed URLs from MongoDB: {e}")
+    return ProcessedUrlIndex(hashes)